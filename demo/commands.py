@@ -0,0 +1,53 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("repair-like-counts")
+@click.option("--post", "posts", multiple=True, help="Only recount these Blog Post1 names")
+@pass_context
+def repair_like_counts(context, posts=None):
+    "Recount Blog Post1.like_count from the Blog Like1 table"
+    from demo.social_media.doctype.blog_post1.blog_post1 import repair_like_counts
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        repair_like_counts(posts)
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+
+@click.command("rebuild-search-index")
+@click.option("--doctype", help="Only rebuild the index of this doctype (Blog Post1 or Blog Post2)")
+@pass_context
+def rebuild_search_index(context, doctype=None):
+    "Rebuild the Blog Search Term index for blog posts"
+    from demo.social_media.search import rebuild_index
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        rebuild_index(doctype)
+        frappe.db.commit()
+    finally:
+        frappe.destroy()
+
+
+@click.command("backfill-genders")
+@pass_context
+def backfill_genders(context):
+    "Resolve missing Blog User genders with batched, cached genderize lookups"
+    from demo.social_media.gender import backfill_genders
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        updated = backfill_genders()
+        print(f"Updated gender on {updated} Blog User records")
+    finally:
+        frappe.destroy()
+
+
+commands = [repair_like_counts, rebuild_search_index, backfill_genders]
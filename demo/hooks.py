@@ -249,5 +249,60 @@ website_route_rules = [
 doc_events = {
     "App User": {
         "before_insert": "social_media.social_media.doctype.app_user.app_user.before_insert"
+    },
+    "Blog Post1": {
+        "on_update": [
+            "demo.social_media.search.index_document",
+            "demo.social_media.user_summary.on_post_change",
+            "demo.social_media.images.on_post_change",
+            "demo.social_media.uploads.on_post_update",
+            "demo.social_media.timelines.on_post_update",
+            "demo.social_media.trending.on_post_update"
+        ],
+        "on_trash": [
+            "demo.social_media.search.remove_document",
+            "demo.social_media.user_summary.on_post_change",
+            "demo.social_media.uploads.on_post_trash",
+            "demo.social_media.timelines.on_post_trash",
+            "demo.social_media.trending.on_post_trash"
+        ]
+    },
+    "Blog Like1": {
+        "after_insert": [
+            "demo.social_media.user_summary.on_like_change",
+            "demo.social_media.trending.on_like_insert"
+        ],
+        "on_trash": [
+            "demo.social_media.user_summary.on_like_change",
+            "demo.social_media.trending.on_like_trash"
+        ]
+    },
+    "Blog User": {
+        "on_trash": [
+            "demo.social_media.user_summary.on_user_delete",
+            "demo.social_media.timelines.on_user_delete"
+        ]
+    },
+    "Blog Post2": {
+        "on_update": [
+            "demo.social_media.search.index_document",
+            "demo.social_media.blog_cache.on_blog_post_change"
+        ],
+        "on_trash": [
+            "demo.social_media.search.remove_document",
+            "demo.social_media.blog_cache.on_blog_post_change"
+        ]
+    },
+    "Blog User2": {
+        "on_update": "demo.social_media.blog_cache.on_blog_author_change",
+        "on_trash": "demo.social_media.blog_cache.on_blog_author_change"
     }
 }
+scheduler_events = {
+    "hourly": [
+        "demo.social_media.trending.rebalance"
+    ],
+    "daily": [
+        "demo.social_media.gender.prune_cache"
+    ]
+}
@@ -0,0 +1,9 @@
+import frappe
+
+from demo.social_media.doctype.blog_post1 import blog_post1
+
+
+def execute():
+    # title is mandatory now; keyset comparisons never match a NULL sort value
+    frappe.db.sql("UPDATE `tabBlog Post1` SET title = '' WHERE title IS NULL")
+    blog_post1.on_doctype_update()
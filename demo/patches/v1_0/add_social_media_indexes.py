@@ -0,0 +1,9 @@
+from demo.social_media.doctype.blog_like1 import blog_like1
+from demo.social_media.doctype.blog_post1 import blog_post1
+from demo.social_media.doctype.blog_post2 import blog_post2
+
+
+def execute():
+    # add_index/add_unique skip indexes that already exist
+    for module in (blog_like1, blog_post1, blog_post2):
+        module.on_doctype_update()
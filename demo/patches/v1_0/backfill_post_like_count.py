@@ -0,0 +1,5 @@
+from demo.social_media.doctype.blog_post1.blog_post1 import repair_like_counts
+
+
+def execute():
+    repair_like_counts()
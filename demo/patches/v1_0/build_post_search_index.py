@@ -0,0 +1,5 @@
+from demo.social_media.search import rebuild_index
+
+
+def execute():
+    rebuild_index()
@@ -0,0 +1,23 @@
+import frappe
+
+
+def execute():
+    # the route column becomes unique: empty routes turn into NULL and
+    # repeated routes keep their oldest post, the others get a free suffix
+    frappe.db.sql("UPDATE `tabBlog Post2` SET route = NULL WHERE route = ''")
+
+    duplicates = frappe.db.sql_list("""
+        SELECT route FROM `tabBlog Post2`
+        WHERE route IS NOT NULL
+        GROUP BY route
+        HAVING COUNT(*) > 1
+    """)
+
+    for route in duplicates:
+        names = frappe.get_all("Blog Post2", filters={"route": route}, pluck="name", order_by="creation asc")
+        suffix = 1
+        for name in names[1:]:
+            suffix += 1
+            while frappe.db.exists("Blog Post2", {"route": f"{route}-{suffix}"}):
+                suffix += 1
+            frappe.db.set_value("Blog Post2", name, "route", f"{route}-{suffix}", update_modified=False)
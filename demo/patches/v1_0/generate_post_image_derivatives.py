@@ -0,0 +1,7 @@
+import frappe
+
+from demo.social_media.images import enqueue_post_images
+
+
+def execute():
+    enqueue_post_images(frappe.get_all("Blog Post1", filters={"image": ["is", "set"]}, pluck="name"))
@@ -0,0 +1,23 @@
+import frappe
+
+from demo.social_media.user_summary import SUMMARY_KEY_PREFIX
+
+
+def execute():
+    # keep the earliest like of every (post, user) pair before the unique index is added
+    frappe.db.sql("""
+        DELETE bl FROM `tabBlog Like1` bl
+        INNER JOIN `tabBlog Like1` earlier
+            ON earlier.post = bl.post
+            AND earlier.user = bl.user
+            AND (earlier.creation < bl.creation
+                OR (earlier.creation = bl.creation AND earlier.name < bl.name))
+    """)
+
+    if frappe.db.has_column("Blog Post1", "like_count"):
+        from demo.social_media.doctype.blog_post1.blog_post1 import repair_like_counts
+
+        repair_like_counts()
+
+    # cached summaries count the removed likes
+    frappe.cache().delete_keys(SUMMARY_KEY_PREFIX)
@@ -0,0 +1,30 @@
+import os
+
+import frappe
+
+from demo.social_media.images import (
+    DERIVATIVE_EXTENSIONS,
+    DERIVATIVES_FOLDER,
+    IMAGE_SIZES,
+    enqueue_post_images,
+)
+
+
+def execute():
+    # Derivatives were named after the file stem alone, so "a.jpg" and "a.png" shared
+    # theirs. Posts show their original until the derivatives are rebuilt under the new names.
+    images = frappe.get_all("Blog Post1", filters={"image": ["is", "set"]}, pluck="image", distinct=True)
+    frappe.db.sql(
+        f"UPDATE `tabBlog Post1` SET {', '.join(f'{fieldname} = NULL' for fieldname, _ in IMAGE_SIZES.values())}"
+    )
+
+    folder = frappe.get_site_path("public", "files", DERIVATIVES_FOLDER)
+    for image in images:
+        stem = os.path.splitext(os.path.basename(image))[0]
+        for size in IMAGE_SIZES:
+            for extension in DERIVATIVE_EXTENSIONS:
+                path = os.path.join(folder, f"{stem}-{size}.{extension}")
+                if os.path.exists(path):
+                    os.remove(path)
+
+    enqueue_post_images(frappe.get_all("Blog Post1", filters={"image": ["is", "set"]}, pluck="name"))
@@ -0,0 +1,11 @@
+import frappe
+
+from demo.social_media.blog_cache import clear_blog_list_cache
+from demo.social_media.doctype.blog_post2.blog_post2 import make_preview
+
+
+def execute():
+    for blog in frappe.get_all("Blog Post2", fields=["name", "content"]):
+        frappe.db.set_value("Blog Post2", blog.name, "preview", make_preview(blog.content), update_modified=False)
+
+    clear_blog_list_cache()
@@ -1,5 +1,4 @@
 import frappe
-from frappe.utils.file_manager import save_file
 import hmac
 from frappe.utils.password import get_decrypted_password
 import io
@@ -7,6 +6,19 @@ import csv
 from frappe.utils import strip_html, now_datetime
 import requests
 import re
+from demo.social_media import bulk, cascade, encoding, images, loader, timelines, trending, uploads
+from demo.social_media.auth import authenticated, issue_token
+from demo.social_media.doctype.blog_like1.blog_like1 import get_like, get_or_create_like
+from demo.social_media.doctype.blog_post1.blog_post1 import repair_like_counts
+from demo.social_media.export import (
+    download_export, enqueue_posts_export, get_export_filename, stream_posts_csv, write_posts_csv
+)
+from demo.social_media.gender import get_cached_gender, to_user_gender
+from demo.social_media.pagination import (
+    decode_cursor, encode_cursor, get_fields, get_limit, get_page, get_rows_by_name
+)
+from demo.social_media.search import MIN_TOKEN_LENGTH, build_match_query, index_documents
+from demo.social_media.user_summary import get_user_summaries, invalidate_users
 
 # Create Blog User
 @frappe.whitelist(allow_guest=True)
@@ -52,24 +64,13 @@ def create_user(name, email, password, mobile=None, address=None, country=None,
             "required_fields": validation_errors
         }
     
-    if not gender and name:
-        try:
+    # Known first names are answered from the gender cache without any outbound call
+    first_name = name.strip().split()[0]
+    if not gender:
+        cached_gender = get_cached_gender(first_name)
+        if cached_gender:
+            gender = to_user_gender(*cached_gender)
 
-            first_name = name.strip().split()[0]
-            response = requests.get(f"https://api.genderize.io/?name={first_name}", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-
-                if data.get("gender") and data.get("probability", 0) > 0.6:
-                    gender = data.get("gender").capitalize()  
-                else:
-                    gender = "Other"  
-            else:
-                gender = "Other"
-        except Exception as e:
-            frappe.log_error(f"Gender API Error: {str(e)}", "Genderize API")
-            gender = "Other" 
-    
     try:
         user_doc = frappe.get_doc({
             "doctype": "Blog User",
@@ -82,73 +83,80 @@ def create_user(name, email, password, mobile=None, address=None, country=None,
             "state": state,
             "city": city,
             "pincode": pincode,
-            "gender": gender or "Other"
+            "gender": gender
         })
         user_doc.insert(ignore_permissions=True)
         frappe.db.commit()
 
-        # Send welcome email
-        frappe.sendmail(
-            recipients=email,
-            subject="Welcome to Social Media 🎉",
-            message=f"""
-            <h3>Hello {name},</h3>
-            <p>Your account has been successfully created!</p>
-            <p><b>Email:</b> {email}<br>
-            <b>Password:</b> {password}</p>
-            <p>Login and start posting 🚀</p>
-            """
-        )
+        # Gender inference and the welcome email run in background jobs
+        if not gender:
+            frappe.enqueue(
+                "demo.social_media.gender.infer_user_gender",
+                user_id=user_doc.name,
+                first_name=first_name
+            )
+
+        frappe.enqueue("demo.social_media.notifications.send_welcome_email", user_id=user_doc.name)
+
         return {
             "error" : False,
             "status_code": 200,
-            "message": "User created & welcome email sent",
+            "message": "User created & welcome email queued",
         }
     
     except Exception as e:
         frappe.db.rollback()
         return {"status": "error", "message": str(e)}
     
+# Fields list endpoints may return; contact details and passwords are never exposed
+USER_LIST_FIELDS = ("name", "full_name", "gender", "city", "state", "country", "created_on", "creation")
+USER_LIST_DEFAULT_FIELDS = ("name", "full_name", "gender", "creation")
+
+POST_LIST_FIELDS = (
+    "name", "title", "description", "content", "category", "user", "image",
+    "creation_date", "like_count", "creation", "modified"
+)
+POST_LIST_DEFAULT_FIELDS = ("name", "title", "description", "category", "user", "image", "like_count", "creation")
+
+LIKE_LIST_FIELDS = ("name", "post", "user", "liked_on", "creation")
+
+# Derivative image URLs, filled in by the image job and picked with image_size
+POST_IMAGE_FIELDS = tuple(fieldname for fieldname, _ in images.IMAGE_SIZES.values())
+
 # Get All Blog User
 @frappe.whitelist(allow_guest=True)
-def get_users():
+def get_users(limit=None, cursor=None, fields=None, format=None):
     try:
-        users = frappe.get_all("Blog User", fields=["*"], order_by="creation desc")
-        return {
+        fields = get_fields(fields, USER_LIST_FIELDS, USER_LIST_DEFAULT_FIELDS)
+        users, next_cursor = get_page("Blog User", fields, limit=limit, cursor=cursor)
+        return encoding.respond({
             "status": "success",
             "data": users,
-            "count": len(users)
-        }
+            "count": len(users),
+            "next_cursor": next_cursor
+        }, format=format)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 # Update Blog User
 @frappe.whitelist(allow_guest=True)
+@authenticated()
 def update_user(user_id=None, **kwargs):
 
-    if not user_id or str(user_id).strip() == "":
+    if 'email' in kwargs:
         return {
             "status": "error",
-            "message": "Validation failed",
-            "required_fields": {
-                "user_id": "User Id is required"
-            }
+            "message": "You can't change email"
         }
     
-    if not frappe.db.exists("Blog User", user_id):
+    user_doc = loader.get_doc("Blog User", user_id)
+    if not user_doc:
         return {
             "status": "error",
             "message": "User does not exist"
         }
     
-    if 'email' in kwargs:
-        return {
-            "status": "error",
-            "message": "You can't change email"
-        }
-    
     try:
-        user_doc = frappe.get_doc("Blog User", user_id)
         
         if 'password' in kwargs:
             password = kwargs.get('password')
@@ -188,45 +196,17 @@ def update_user(user_id=None, **kwargs):
 
  # Delete Blog User
 @frappe.whitelist(allow_guest=True)
+@authenticated()
 def delete_user(user_id=None):
-    # Validate user_id
-    if not user_id or str(user_id).strip() == "":
-        return {
-            "status": "error",
-            "message": "Validation failed",
-            "required_fields": {
-                "user_id": "User Id is required"
-            }
-        }
-    
-    if not frappe.db.exists("Blog User", user_id):
-        return {
-            "status": "error",
-            "message": "User does not exist"
-        }
-    
     try:
-        
-        posts = frappe.get_all("Blog Post1", filters={"user": user_id}, pluck="name")
-        for post_id in posts:
-          
-            likes = frappe.get_all("Blog Like1", filters={"post": post_id}, pluck="name")
-            for like in likes:
-                frappe.delete_doc("Blog Like1", like, ignore_permissions=True)
-            
-            frappe.delete_doc("Blog Post1", post_id, ignore_permissions=True)
-        
-        # Delete user's likes on other posts
-        user_likes = frappe.get_all("Blog Like1", filters={"user": user_id}, pluck="name")
-        for like in user_likes:
-            frappe.delete_doc("Blog Like1", like, ignore_permissions=True)
-        
-        frappe.delete_doc("Blog User", user_id, ignore_permissions=True)
+        # Posts, their likes and the user's likes on other posts go in chunked set-based deletes
+        deleted = cascade.delete_user(user_id)
         frappe.db.commit()
         
         return {
             "status": "success",
-            "message": f"User {user_id} deleted successfully with all posts and likes"
+            "message": f"User {user_id} deleted successfully with all posts and likes",
+            "deleted": deleted
         }
     
     except Exception as e:
@@ -238,14 +218,14 @@ def delete_user(user_id=None):
     
 # Create Blog Post
 @frappe.whitelist(allow_guest=True)
+@authenticated(param="user")
 def create_post(title=None, description=None, content=None, category=None, user=None):
   
     required_fields = {
         "title": title,
         "description": description,
         "content": content,
-        "category": category,
-        "user": user
+        "category": category
     }
     
     validation_errors = {}
@@ -254,39 +234,29 @@ def create_post(title=None, description=None, content=None, category=None, user=
         if not field_value or str(field_value).strip() == "":
             validation_errors[field_name] = f"{field_name.replace('_', ' ').title()} is required"
     
-    image_file = frappe.request.files.get('image')
-    if not image_file:
-        validation_errors["image"] = "Image is required"
-    
-    if validation_errors:
-        return {
-            "status": "error",
-            "message": "Validation failed",
-            "required_fields": validation_errors
-        }
-    
-    if not frappe.db.exists("Blog User", user):
-        validation_errors["user"] = "User does not exist"
+    # Streamed to disk and checked before any database work
+    received = None
+    try:
+        received = uploads.receive_request_image("image")
+        if not received:
+            validation_errors["image"] = "Image is required"
+    except uploads.InvalidImage as e:
+        validation_errors["image"] = str(e)
     
     if validation_errors:
+        if received:
+            received.discard()
         return {
             "status": "error",
             "message": "Validation failed",
             "required_fields": validation_errors
         }
     
-    image = None
     try:
-        image_doc = save_file(
-            fname=image_file.filename,
-            content=image_file.stream.read(),
-            dt=None,
-            dn=None,
-            folder='Home/Attachments',
-            is_private=0
-        )
-        image = image_doc.file_url
+        image = uploads.save_image(received)
     except Exception as e:
+        received.discard()
+        frappe.db.rollback()
         return {
             "status": "error",
             "message": "Failed to upload image",
@@ -313,45 +283,208 @@ def create_post(title=None, description=None, content=None, category=None, user=
         return {"status": "error", "message": str(e)}
 
 
+# Create Blog Posts in Bulk
+@frappe.whitelist(allow_guest=True)
+@authenticated()
+def create_posts_bulk(posts=None, user_id=None):
+    """
+    Create many posts in one transaction for the logged-in user. `posts` is a JSON
+    array of objects with title, description, content, category, an optional user
+    (which must be the caller) and the optional URL of an already uploaded image.
+    Returns one result per item, in the order sent.
+    """
+    try:
+        items = bulk.parse_items(posts or [])
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+    for item in items:
+        if isinstance(item, dict) and not item.get("user"):
+            item["user"] = user_id
+
+    users = bulk.existing_names("Blog User", [i.get("user") for i in items if isinstance(i, dict)])
+    categories = bulk.existing_names("Blog Category1", [i.get("category") for i in items if isinstance(i, dict)])
+    # Only images stored by an earlier upload can be shared, their references are counted
+    stored_images = uploads.lock_stored_images([i.get("image") for i in items if isinstance(i, dict)])
+
+    results = []
+    valid = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({"index": index, "status": "error", "required_fields": {"post": "Expected an object"}})
+            continue
+
+        validation_errors = {}
+        for field_name in ("title", "description", "content", "category", "user"):
+            if not item.get(field_name) or str(item.get(field_name)).strip() == "":
+                validation_errors[field_name] = f"{field_name.replace('_', ' ').title()} is required"
+
+        if "user" not in validation_errors and item["user"] != user_id:
+            validation_errors["user"] = "Access Denied: You can only create your own posts"
+        elif "user" not in validation_errors and item["user"] not in users:
+            validation_errors["user"] = "User does not exist"
+        if "category" not in validation_errors and item["category"] not in categories:
+            validation_errors["category"] = "Category does not exist"
+        if item.get("image") and item["image"] not in stored_images:
+            validation_errors["image"] = "Image must be the URL of an uploaded image"
+
+        result = {"index": index}
+        if validation_errors:
+            result.update(status="error", required_fields=validation_errors)
+        else:
+            valid.append((result, bulk.post_row(item)))
+        results.append(result)
+
+    try:
+        names = bulk.insert_rows("Blog Post1", "POST", [row for _, row in valid])
+        index_documents("Blog Post1", names)
+        uploads.acquire_images([row.get("image") for _, row in valid])
+        timelines.add_posts(frappe.get_all(
+            "Blog Post1", filters={"name": ["in", names]}, fields=["name", "creation", "category", "user"]
+        ) if names else [])
+        images.enqueue_post_images([name for name, (_, row) in zip(names, valid, strict=True) if row.get("image")])
+        invalidate_users([row["user"] for _, row in valid])
+        frappe.db.commit()
+    except Exception as e:
+        frappe.db.rollback()
+        for result, _ in valid:
+            result.update(status="error", message=str(e))
+        names = []
+    else:
+        for (result, _), name in zip(valid, names, strict=True):
+            result.update(status="success", post_id=name)
+
+    return {
+        "status": "success" if names else "error",
+        "created": len(names),
+        "failed": len(results) - len(names),
+        "results": results
+    }
+
 # Get All Blog Post
 @frappe.whitelist(allow_guest=True)
-def get_posts():
+def get_posts(limit=None, cursor=None, fields=None, image_size=None, format=None):
+    try:
+        fields = get_fields(fields, POST_LIST_FIELDS, POST_LIST_DEFAULT_FIELDS)
+        image_field = images.get_image_field(image_size) if "image" in fields else None
+        posts, next_cursor = get_page(
+            "Blog Post1", [*fields, image_field] if image_field else fields, limit=limit, cursor=cursor
+        )
+        images.resolve_images(posts, image_field)
+        return encoding.respond({
+            "status": "success",
+            "data": posts,
+            "count": len(posts),
+            "next_cursor": next_cursor
+        }, format=format)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+# Get a Category's Posts, newest first
+@frappe.whitelist(allow_guest=True)
+def get_category_feed(category=None, limit=None, cursor=None, fields=None, image_size=None):
+    if not category or str(category).strip() == "":
+        return {
+            "status": "error",
+            "message": "Validation failed",
+            "required_fields": {
+                "category": "Category is required"
+            }
+        }
+    try:
+        fields = get_fields(fields, POST_LIST_FIELDS, POST_LIST_DEFAULT_FIELDS)
+        image_field = images.get_image_field(image_size)
+        posts, next_cursor = timelines.get_feed(
+            "category", category, fields, limit=limit, cursor=cursor, image_field=image_field
+        )
+        return {
+            "status": "success",
+            "data": posts,
+            "count": len(posts),
+            "next_cursor": next_cursor
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+# Get a User's Posts, newest first
+@frappe.whitelist(allow_guest=True)
+def get_user_feed(user=None, limit=None, cursor=None, fields=None, image_size=None):
+    if not user or str(user).strip() == "":
+        return {
+            "status": "error",
+            "message": "Validation failed",
+            "required_fields": {
+                "user": "User is required"
+            }
+        }
     try:
-        posts = frappe.get_all("Blog Post1", fields=["*"], order_by="creation desc")
+        fields = get_fields(fields, POST_LIST_FIELDS, POST_LIST_DEFAULT_FIELDS)
+        image_field = images.get_image_field(image_size)
+        posts, next_cursor = timelines.get_feed(
+            "user", user, fields, limit=limit, cursor=cursor, image_field=image_field
+        )
         return {
             "status": "success",
             "data": posts,
-            "count": len(posts)
+            "count": len(posts),
+            "next_cursor": next_cursor
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+# Get Trending Posts, overall or in one category
+@frappe.whitelist(allow_guest=True)
+def get_trending_posts(category=None, limit=None, fields=None, image_size=None):
+    """
+    Posts ranked by their likes, each like weighing half as much every
+    trending.HALF_LIFE seconds. Served from the top-K lists, at most trending.TOP_K posts.
+    """
+    try:
+        fields = get_fields(fields, POST_LIST_FIELDS, POST_LIST_DEFAULT_FIELDS)
+        image_field = images.get_image_field(image_size)
+        ranked = dict(trending.get_trending(category or None, get_limit(limit)))
+        columns = list(dict.fromkeys([*fields, "name", *filter(None, [image_field])]))
+        posts = get_rows_by_name("Blog Post1", list(ranked), columns)
+        for post in posts:
+            post["trending_score"] = round(ranked[post.name], 4)
+            if "name" not in fields:
+                post.pop("name")
+
+        return {
+            "status": "success",
+            "data": images.resolve_images(posts, image_field),
+            "count": len(posts)
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
 # Update Blog Post
 @frappe.whitelist(allow_guest=True)
+@authenticated()
 def update_post(post_id=None, user_id=None, **kwargs):
     validation_errors = {}
     
     if not post_id or str(post_id).strip() == "":
         validation_errors["post_id"] = "Post Id is required"
+
+    # Stored images are reference counted, a new image can only come in as an upload
+    if "image" in kwargs:
+        validation_errors["image"] = "Upload the image as a file"
     
-    if not user_id or str(user_id).strip() == "":
-        validation_errors["user_id"] = "User Id is required"
-    
-    if validation_errors:
-        return {
-            "status": "error",
-            "message": "Validation failed",
-            "required_fields": validation_errors
-        }
-    
-    if not frappe.db.exists("Blog Post1", post_id):
-        validation_errors["post_id"] = "Post does not exist"
+    # An optional new image, streamed to disk and checked before any database work
+    received = None
+    try:
+        received = uploads.receive_request_image("image")
+    except uploads.InvalidImage as e:
+        validation_errors["image"] = str(e)
     
-    if not frappe.db.exists("Blog User", user_id):
-        validation_errors["user_id"] = "User does not exist"
+    if not validation_errors:
+        post_doc = loader.require(validation_errors, "post_id", "Blog Post1", post_id, "Post does not exist")
     
     if validation_errors:
+        if received:
+            received.discard()
         return {
             "status": "error",
             "message": "Validation failed",
@@ -359,8 +492,6 @@ def update_post(post_id=None, user_id=None, **kwargs):
         }
     
     try:
-        post_doc = frappe.get_doc("Blog Post1", post_id)
-        
         # Check if the user is the owner
         if post_doc.user != user_id:
             return {
@@ -368,19 +499,11 @@ def update_post(post_id=None, user_id=None, **kwargs):
                 "message": "Access Denied: You can only update your own posts"
             }
         
-        image_file = frappe.request.files.get('image')
-        if image_file:
+        if received:
             try:
-                image_doc = save_file(
-                    fname=image_file.filename,
-                    content=image_file.stream.read(),
-                    dt=None,
-                    dn=None,
-                    folder='Home/Attachments',
-                    is_private=0
-                )
-                kwargs['image'] = image_doc.file_url
+                kwargs['image'] = uploads.save_image(received)
             except Exception as e:
+                frappe.db.rollback()
                 return {
                     "status": "error",
                     "message": "Failed to upload image",
@@ -388,7 +511,7 @@ def update_post(post_id=None, user_id=None, **kwargs):
                 }
 
         for key, value in kwargs.items():
-            if hasattr(post_doc, key) and key != 'user':
+            if hasattr(post_doc, key) and key not in ('user', 'like_count', *POST_IMAGE_FIELDS):
                 setattr(post_doc, key, value)
         
         post_doc.save(ignore_permissions=True)
@@ -404,17 +527,20 @@ def update_post(post_id=None, user_id=None, **kwargs):
         frappe.db.rollback()
         return {"status": "error", "message": str(e)}
     
+    finally:
+        # No-op once the image was saved
+        if received:
+            received.discard()
+    
 # Delete Blog Post
 @frappe.whitelist(allow_guest=True)
+@authenticated()
 def delete_post(post_id=None, user_id=None):
     
     validation_errors = {}
     
     if not post_id or str(post_id).strip() == "":
         validation_errors["post_id"] = "Post Id is required"
-    
-    if not user_id or str(user_id).strip() == "":
-        validation_errors["user_id"] = "User Id is required"
  
     if validation_errors:
         return {
@@ -423,22 +549,14 @@ def delete_post(post_id=None, user_id=None):
             "required_fields": validation_errors
         }
 
-    if not frappe.db.exists("Blog Post1", post_id):
+    post_doc = loader.get_doc("Blog Post1", post_id)
+    if not post_doc:
         return {
             "status": "error",
             "message": "Post does not exist"
         }
     
-    if not frappe.db.exists("Blog User", user_id):
-        return {
-            "status": "error",
-            "message": "User does not exist"
-        }
-    
     try:
- 
-        post_doc = frappe.get_doc("Blog Post1", post_id)
-        
         # Check if the user is the owner
         if post_doc.user != user_id:
             return {
@@ -446,18 +564,14 @@ def delete_post(post_id=None, user_id=None):
                 "message": "Access Denied: You can only delete your own posts"
             }
         
-        # Delete associated likes first
-        likes = frappe.get_all("Blog Like1", filters={"post": post_id}, pluck="name")
-        for like in likes:
-            frappe.delete_doc("Blog Like1", like, ignore_permissions=True)
-        
-        # Delete the post
-        frappe.delete_doc("Blog Post1", post_id, ignore_permissions=True)
+        # Delete the post with its likes in set-based statements
+        deleted = cascade.delete_posts([post_id])
         frappe.db.commit()
         
         return {
             "status": "success",
-            "message": f"Post {post_id} deleted successfully with all likes"
+            "message": f"Post {post_id} deleted successfully with all likes",
+            "deleted": deleted
         }
     
     except Exception as e:
@@ -467,26 +581,190 @@ def delete_post(post_id=None, user_id=None):
             "message": str(e)
         }
     
-# Create Like for a Post
+# Create Like for a Post (repeated calls return the existing like)
 @frappe.whitelist(allow_guest=True)
-def create_like(post_id, user_id):
-    like_doc = frappe.get_doc({
-        "doctype": "Blog Like1",
-        "post": post_id,
-        "user": user_id
-    })
-    like_doc.insert(ignore_permissions=True)
+@authenticated()
+def create_like(post_id, user_id=None):
+    like_id, created = get_or_create_like(post_id, user_id)
     frappe.db.commit()
-    return {"status": "success", "like_id": like_doc.name}
+    return {"status": "success", "like_id": like_id, "created": created}
+
+# Like or Unlike a Post
+@frappe.whitelist(allow_guest=True)
+@authenticated()
+def toggle_like(post_id=None, user_id=None, liked=None):
+    """
+    Flip the caller's like on a post, or set it explicitly with liked=true/false.
+    Safe to retry: the (post, user) unique index allows at most one like.
+    """
+    validation_errors = {}
+
+    if not post_id or str(post_id).strip() == "":
+        validation_errors["post_id"] = "Post Id is required"
+
+    if validation_errors:
+        return {
+            "status": "error",
+            "message": "Validation failed",
+            "required_fields": validation_errors
+        }
+
+    try:
+        like_id = get_like(post_id, user_id)
+        if liked is None or str(liked).strip() == "":
+            want_like = not like_id
+        else:
+            want_like = str(liked).lower() in ("1", "true", "yes", "y")
+
+        if want_like and not like_id:
+            like_id, _ = get_or_create_like(post_id, user_id)
+        elif not want_like and like_id:
+            frappe.delete_doc("Blog Like1", like_id, ignore_permissions=True)
+            like_id = None
+        frappe.db.commit()
+
+        return {
+            "status": "success",
+            "liked": bool(like_id),
+            "like_id": like_id,
+            "like_count": frappe.db.get_value("Blog Post1", post_id, "like_count") or 0
+        }
+
+    except Exception as e:
+        frappe.db.rollback()
+        return {"status": "error", "message": str(e)}
+
+# Create Likes in Bulk
+@frappe.whitelist(allow_guest=True)
+@authenticated()
+def create_likes_bulk(likes=None, user_id=None):
+    """
+    Create many likes in one transaction for the logged-in user. `likes` is a JSON
+    array of {"post_id": ...} objects, a "user_id" in an item must be the caller.
+    Returns one result per item.
+    """
+    try:
+        items = bulk.parse_items(likes or [])
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+    items = [
+        {"post": i.get("post_id") or i.get("post"), "user": i.get("user_id") or i.get("user") or user_id}
+        if isinstance(i, dict) else {}
+        for i in items
+    ]
+    posts = bulk.existing_names("Blog Post1", [i.get("post") for i in items])
+    users = bulk.existing_names("Blog User", [i.get("user") for i in items])
+
+    # Pairs that are already liked, fetched in one query through the (post, user) index
+    existing = {
+        (like.post, like.user): like.name
+        for like in frappe.get_all(
+            "Blog Like1",
+            filters={"post": ["in", list(posts) or [""]], "user": ["in", list(users) or [""]]},
+            fields=["name", "post", "user"]
+        )
+    }
+
+    results = []
+    valid = []
+    pending = {}
+    for index, item in enumerate(items):
+        validation_errors = {}
+        if not item.get("post"):
+            validation_errors["post_id"] = "Post Id is required"
+        elif item["post"] not in posts:
+            validation_errors["post_id"] = "Post does not exist"
+        if not item.get("user"):
+            validation_errors["user_id"] = "User Id is required"
+        elif item["user"] != user_id:
+            validation_errors["user_id"] = "Access Denied: You can only like posts as yourself"
+        elif item["user"] not in users:
+            validation_errors["user_id"] = "User does not exist"
+
+        result = {"index": index}
+        pair = (item.get("post"), item.get("user"))
+        if validation_errors:
+            result.update(status="error", required_fields=validation_errors)
+        elif pair in existing:
+            result.update(status="success", like_id=existing[pair], created=False)
+        elif pair in pending:
+            # repeated in this batch, reported with the like created for its first occurrence
+            pending[pair].append(result)
+        else:
+            pending[pair] = [result]
+            valid.append((result, bulk.like_row(item)))
+        results.append(result)
+
+    inserted = set()
+    try:
+        names = bulk.insert_rows("Blog Like1", "LIKE", [row for _, row in valid], ignore_duplicates=True)
+        # The unique (post, user) index makes INSERT IGNORE skip pairs a concurrent
+        # request liked first, their reserved names have no row
+        inserted = set(frappe.get_all("Blog Like1", filters={"name": ["in", names]}, pluck="name")) if names else set()
+        skipped = [row for name, (_, row) in zip(names, valid, strict=True) if name not in inserted]
+        if skipped:
+            skipped_pairs = {(row["post"], row["user"]) for row in skipped}
+            existing.update({
+                (like.post, like.user): like.name
+                for like in frappe.get_all(
+                    "Blog Like1",
+                    filters={
+                        "post": ["in", list({post for post, _ in skipped_pairs})],
+                        "user": ["in", list({user for _, user in skipped_pairs})]
+                    },
+                    fields=["name", "post", "user"]
+                )
+            })
+
+        liked_posts = list({row["post"] for name, (_, row) in zip(names, valid, strict=True) if name in inserted})
+        if liked_posts:
+            repair_like_counts(liked_posts)
+            trending.refresh_posts(liked_posts)
+            invalidate_users(frappe.get_all("Blog Post1", filters={"name": ["in", liked_posts]}, pluck="user"))
+        frappe.db.commit()
+    except Exception as e:
+        frappe.db.rollback()
+        for group in pending.values():
+            for result in group:
+                result.update(status="error", message=str(e))
+        inserted = set()
+    else:
+        for (_, row), name in zip(valid, names, strict=True):
+            pair = (row["post"], row["user"])
+            created = name in inserted
+            first, *repeats = pending[pair]
+            first.update(status="success", like_id=name if created else existing.get(pair), created=created)
+            for result in repeats:
+                result.update(status="success", like_id=first["like_id"], created=False)
+
+    failed = sum(1 for result in results if result.get("status") == "error")
+    return {
+        "status": "error" if failed == len(results) and results else "success",
+        "created": len(inserted),
+        "failed": failed,
+        "results": results
+    }
 
 # Get All Likes
 @frappe.whitelist(allow_guest=True)
-def get_likes():
-    return frappe.get_all("Blog Like1", fields=["*"])
+def get_likes(limit=None, cursor=None, fields=None):
+    try:
+        fields = get_fields(fields, LIKE_LIST_FIELDS, LIKE_LIST_FIELDS)
+        likes, next_cursor = get_page("Blog Like1", fields, limit=limit, cursor=cursor)
+        return {
+            "status": "success",
+            "data": likes,
+            "count": len(likes),
+            "next_cursor": next_cursor
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
 # Delete Like
 @frappe.whitelist(allow_guest=True)
-def delete_like(like_id=None):
+@authenticated()
+def delete_like(like_id=None, user_id=None):
 
     if not like_id or str(like_id).strip() == "":
         return {
@@ -496,11 +774,17 @@ def delete_like(like_id=None):
                 "like_id": "Like Id is required"
             }
         }
-    if not frappe.db.exists("Blog Like1", like_id):
+    like_owner = frappe.db.get_value("Blog Like1", like_id, "user")
+    if not like_owner:
         return {
             "status": "error",
             "message": "Like does not exist"
         }
+    if like_owner != user_id:
+        return {
+            "status": "error",
+            "message": "Access Denied: You can only delete your own likes"
+        }
     try:
         # Delete the like
         frappe.delete_doc("Blog Like1", like_id, ignore_permissions=True)
@@ -519,51 +803,52 @@ def delete_like(like_id=None):
     
 # Get User's Liked Posts
 @frappe.whitelist(allow_guest=True)
-def get_user_liked_posts(user_id=None):
+@authenticated()
+def get_user_liked_posts(user_id=None, limit=None, cursor=None, image_size=None):
+    try:
+        limit = get_limit(limit)
+        image_field = images.get_image_field(image_size)
+        params = {"user": user_id, "limit": limit + 1}
+        keyset = ""
+        if cursor:
+            params["cursor_creation"], params["cursor_name"] = decode_cursor(cursor, 2)
+            keyset = """AND (bl.creation < %(cursor_creation)s
+                OR (bl.creation = %(cursor_creation)s AND bl.name < %(cursor_name)s))"""
 
-    if not user_id or str(user_id).strip() == "":
-        return {
-            "status": "error",
-            "message": "Validation failed",
-            "required_fields": {
-                "user_id": "User Id is required"
-            }
-        }
+        # Likes and their posts in one query, newest like first
+        liked_posts = frappe.db.sql(f"""
+            SELECT
+                bl.name AS like_id,
+                bl.creation AS liked_at,
+                bp.name AS post_id,
+                bp.title,
+                bp.description,
+                bp.content,
+                bp.category,
+                bp.image,
+                {f"bp.{image_field}," if image_field else ""}
+                bp.user AS post_owner,
+                bp.creation AS created_at
+            FROM `tabBlog Like1` bl
+            INNER JOIN `tabBlog Post1` bp ON bp.name = bl.post
+            WHERE bl.user = %(user)s {keyset}
+            ORDER BY bl.creation DESC, bl.name DESC
+            LIMIT %(limit)s
+        """, params, as_dict=True)
 
-    if not frappe.db.exists("Blog User", user_id):
-        return {
-            "status": "error",
-            "message": "User does not exist"
-        }
-    
-    try:
-        likes = frappe.get_all(
-            "Blog Like1",
-            filters={"user": user_id},
-            fields=["name", "post", "user", "creation"],
-            order_by="creation desc"
-        )
-        
-        liked_posts = []
-        for like in likes:
-            post = frappe.get_doc("Blog Post1", like["post"])
-            liked_posts.append({
-                "like_id": like["name"],
-                "liked_at": like["creation"],
-                "post_id": post.name,
-                "title": post.title,
-                "description": post.description,
-                "content": post.content,
-                "category": post.category,
-                "image": post.image,
-                "post_owner": post.user,
-                "created_at": post.creation
-            })
+        next_cursor = None
+        if len(liked_posts) > limit:
+            liked_posts = liked_posts[:limit]
+            next_cursor = encode_cursor(liked_posts[-1].liked_at, liked_posts[-1].like_id)
+        images.resolve_images(liked_posts, image_field)
+
+        total_likes = frappe.db.count("Blog Like1", {"user": user_id})
         
         return {
             "status": "success",
             "data": liked_posts,
-            "count": f"{user_id} liked {len(liked_posts)} posts"
+            "count": f"{user_id} liked {total_likes} posts",
+            "next_cursor": next_cursor
         }
     
     except Exception as e:
@@ -624,12 +909,17 @@ def login_user(email=None, password=None):
                 "message": "Invalid Password"
             }
 
+        # Send the token back as the X-Blog-Token header (or `token` argument) on user actions
+        token, expires_at = issue_token(user["name"])
+
         return {
             "status": "success",
             "message": "Login successful",
             "user_id": user["name"],
             "full_name": user.get("full_name"),
-            "email": user["email"]
+            "email": user["email"],
+            "token": token,
+            "expires_at": expires_at
         }
     
     except Exception as e:
@@ -641,48 +931,49 @@ def login_user(email=None, password=None):
 
 # Get All Users with their Posts and Like Counts
 @frappe.whitelist(allow_guest=True)
-def get_all_users_with_posts_and_likes():
-    users = frappe.get_all("Blog User", fields=["name", "email", "full_name"])
-
-    user_data = []
-    for u in users:
-        # Get all posts by this user
-        posts = frappe.get_all(
-            "Blog Post1",
-            filters={"user": u.name},
-            fields=["name", "title"]
-        )
+def get_all_users_with_posts_and_likes(limit=None, cursor=None):
+    try:
+        users, next_cursor = get_page("Blog User", ["name", "email", "full_name"], limit=limit, cursor=cursor)
+        summaries = get_user_summaries([u.name for u in users])
 
-        # Count likes for each post
-        post_list = []
-        for p in posts:
-            like_count = frappe.db.count("Blog Like1", {"post": p.name})
-            post_list.append({
-                "title": p.title,
-                "likes": like_count
+        user_data = []
+        for u in users:
+            summary = summaries[u.name]
+            user_data.append({
+                "user_id": u.name,
+                "name": u.full_name,
+                "email": u.email,
+                "total_posts": summary["total_posts"],
+                "posts": summary["posts"]
             })
 
-        user_data.append({
-            "user_id": u.name,
-            "name": u.full_name,
-            "email": u.email,
-            "total_posts": len(posts),
-            "posts": post_list
-        })
-
-    return user_data
+        return {
+            "status": "success",
+            "data": user_data,
+            "count": len(user_data),
+            "next_cursor": next_cursor
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
 # Export Posts to CSV
 @frappe.whitelist(allow_guest=True)
-def export_posts_csv_guest(user_id=None, email=None, download="true", send_email="true"):
+def export_posts_csv_guest(user_id=None, email=None, download="true", send_email="true", mode="inline", compress="false"):
     """
     Simple guest-access export for Blog User posts.
     - Provide either user_id (Blog User.name) or email (Blog User.email).
-    - download/send_email accept strings like "true"/"false" or "1"/"0".
+    - download/send_email/compress accept strings like "true"/"false" or "1"/"0".
+    - mode "inline" builds the CSV in the request (original behaviour),
+      "stream" returns a chunked download (gzip when compress is set),
+      "background" builds the file in a job and emails a download link.
     """
     # parse booleans
     download = str(download).lower() in ("1", "true", "yes", "y")
     send_email = str(send_email).lower() in ("1", "true", "yes", "y")
+    compress = str(compress).lower() in ("1", "true", "yes", "y")
+
+    if mode not in ("inline", "stream", "background"):
+        frappe.throw("mode must be one of inline, stream or background")
 
     # require at least one identifier
     if not user_id and not email:
@@ -694,38 +985,20 @@ def export_posts_csv_guest(user_id=None, email=None, download="true", send_email
         if not user_id:
             frappe.throw("No Blog User found with that email")
 
-    # fetch posts for the Blog User
-    posts = frappe.get_all(
-        "Blog Post1",
-        filters={"user": user_id},
-        fields=["name", "title", "description", "content", "category", "image", "creation", "modified"],
-        order_by="creation desc"
-    )
+    if mode == "stream":
+        return stream_posts_csv(user_id, compress=compress)
+
+    if mode == "background":
+        recipient = email or frappe.db.get_value("Blog User", user_id, "email")
+        if not enqueue_posts_export(user_id, recipient=recipient, compress=compress):
+            return {"status": "success", "message": "An export is already being prepared, the link will be emailed"}
+        return {"status": "success", "message": "Export queued, a download link will be emailed when it is ready"}
 
     # build CSV in-memory
-    si = io.StringIO()
-    writer = csv.writer(si, quoting=csv.QUOTE_MINIMAL)
-    header = ["post_id", "title", "description", "content", "category", "image_url", "created_at", "updated_at", "likes"]
-    writer.writerow(header)
-
-    for p in posts:
-        like_count = frappe.db.count("Blog Like1", {"post": p.get("name")})
-        row = [
-            p.get("name") or "",
-            p.get("title") or "",
-            strip_html(p.get("description") or ""),
-            strip_html(p.get("content") or ""),
-            p.get("category") or "",
-            p.get("image") or "",
-            str(p.get("creation") or ""),
-            str(p.get("modified") or ""),
-            like_count
-        ]
-        writer.writerow(row)
-
-    csv_text = si.getvalue()
-    csv_bytes = csv_text.encode("utf-8-sig")  # BOM for Excel
-    fname = f"posts_{user_id}_{now_datetime().strftime('%Y%m%d%H%M%S')}.csv"
+    buffer = io.BytesIO()
+    write_posts_csv(buffer, user_id)
+    csv_bytes = buffer.getvalue()
+    fname = get_export_filename(user_id)
 
     # send email with attachment if requested
     if send_email:
@@ -751,6 +1024,21 @@ def export_posts_csv_guest(user_id=None, email=None, download="true", send_email
 
     return {"status": "success", "message": "CSV generated" + (" and emailed" if send_email else ""), "filename": fname}
 
+# Download a background posts export from its emailed link
+@frappe.whitelist(allow_guest=True)
+def download_posts_export(file, token):
+    return download_export(file, token)
+
+# Sortable columns for get_posts_advanced: sort_by -> (SQL expression, result key)
+POST_SORT_FIELDS = {
+    "creation": ("bp.creation", "creation"),
+    "modified": ("bp.modified", "modified"),
+    "title": ("bp.title", "title"),
+    "total_likes": ("bp.like_count", "total_likes"),
+    "name": ("bp.name", "name"),
+    "relevance": ("sr.relevance", "relevance"),
+}
+
 # Advanced Post Retrieval with Filtering, Sorting, Pagination
 @frappe.whitelist(allow_guest=True)
 def get_posts_advanced(
@@ -763,32 +1051,94 @@ def get_posts_advanced(
     user=None,
     min_likes=None,
     max_likes=None,
-    search=None
+    search=None,
+    cursor=None,
+    image_size=None,
+    format=None
 ):
-    page = int(page)
-    page_size = int(page_size)
-    offset = (page - 1) * page_size
+    """
+    Filtered, sorted post listing with two paging modes.
+    - page/page_size: classic LIMIT/OFFSET paging (kept for existing clients).
+    - cursor: keyset paging; pass the previous response's next_cursor to seek
+      straight to the next page without scanning the skipped rows.
+    image_size (thumbnail, feed, full) swaps image for that derivative once generated.
+    format (json, columnar, msgpack) or the Accept header picks the encoding.
+    """
+    page = max(int(page), 1)
+    page_size = get_limit(page_size, default=10)
+    sort_order = str(sort_order).lower()
+
+    if sort_by not in POST_SORT_FIELDS:
+        return {
+            "status": "error",
+            "message": f"Invalid sort_by, use one of: {', '.join(POST_SORT_FIELDS)}"
+        }
+
+    if sort_order not in ("asc", "desc"):
+        return {
+            "status": "error",
+            "message": "Invalid sort_order, use asc or desc"
+        }
 
-    filters = {}
+    image_sizes = (*images.IMAGE_SIZES, images.ORIGINAL_SIZE)
+    if image_size and image_size not in image_sizes:
+        return {
+            "status": "error",
+            "message": f"Invalid image_size, use one of: {', '.join(image_sizes)}"
+        }
+    image_field = images.get_image_field(image_size)
+
+    # Search in title/description/content through the inverted index
+    search_query, params = build_match_query("Blog Post1", search) if search else (None, {})
+    if search and not search_query:
+        return {
+            "status": "error",
+            "message": f"search must contain a word of at least {MIN_TOKEN_LENGTH} characters that is not a stop word"
+        }
+
+    if sort_by == "relevance" and not search_query:
+        return {
+            "status": "error",
+            "message": "sort_by relevance requires a search term"
+        }
+
+    sort_column, sort_key = POST_SORT_FIELDS[sort_by]
+    conditions = []
 
     # Date range filter
     if start_date and end_date:
-        filters["creation"] = ["between", [start_date, end_date]]
+        conditions.append("bp.creation BETWEEN %(start_date)s AND %(end_date)s")
+        params.update(start_date=start_date, end_date=end_date)
 
     # Filter by user
     if user:
-        filters["user"] = user
-
-    # Search in title/description/content
-    search_condition = ""
-    if search:
-        search_condition = f""" AND (
-            title LIKE '%{search}%'
-            OR description LIKE '%{search}%'
-            OR content LIKE '%{search}%'
-        ) """
-
-    query = f"""
+        conditions.append("bp.user = %(user)s")
+        params["user"] = user
+
+    # Like filters
+    if min_likes:
+        conditions.append("bp.like_count >= %(min_likes)s")
+        params["min_likes"] = int(min_likes)
+    if max_likes:
+        conditions.append("bp.like_count <= %(max_likes)s")
+        params["max_likes"] = int(max_likes)
+
+    # Keyset: continue strictly after the (sort value, name) of the last row seen
+    if cursor:
+        cursor_sort_by, cursor_sort_order, cursor_value, cursor_name = decode_cursor(cursor, 4)
+        if (cursor_sort_by, cursor_sort_order) != (sort_by, sort_order):
+            return {
+                "status": "error",
+                "message": "Cursor does not match sort_by/sort_order"
+            }
+
+        operator = "<" if sort_order == "desc" else ">"
+        keyset = f"""({sort_column} {operator} %(cursor_value)s
+            OR ({sort_column} = %(cursor_value)s AND bp.name {operator} %(cursor_name)s))"""
+        params.update(cursor_value=cursor_value, cursor_name=cursor_name)
+        conditions.append(keyset)
+
+    query = """
         SELECT 
             bp.name,
             bp.title,
@@ -798,35 +1148,45 @@ def get_posts_advanced(
             bp.user,
             bp.image,
             bp.creation,
-            COUNT(bl.name) AS total_likes
-        FROM `tabBlog Post1` bp
-        LEFT JOIN `tabBlog Like1` bl ON bl.post = bp.name
-        WHERE 1=1
+            bp.modified,
+            bp.like_count AS total_likes
     """
+    if image_field:
+        query += f", bp.{image_field}"
 
-    # Add filters dynamically
-    if start_date and end_date:
-        query += f" AND bp.creation BETWEEN '{start_date}' AND '{end_date}' "
-    if user:
-        query += f" AND bp.user = '{user}' "
-    if search_condition:
-        query += search_condition
+    if search_query:
+        query += f"""
+            , sr.relevance
+        FROM `tabBlog Post1` bp
+        INNER JOIN ({search_query}) sr ON sr.reference_name = bp.name
+        """
+    else:
+        query += " FROM `tabBlog Post1` bp "
 
-    # Group and apply like filters
-    query += " GROUP BY bp.name "
-    if min_likes:
-        query += f" HAVING total_likes >= {int(min_likes)} "
-    if max_likes:
-        query += f" HAVING total_likes <= {int(max_likes)} "
+    # Add filters dynamically
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
 
-    # Sorting
-    query += f" ORDER BY {sort_by} {sort_order.upper()} "
+    # Sorting, with name as a tiebreaker so the order is stable for cursors
+    query += f" ORDER BY {sort_column} {sort_order.upper()}, bp.name {sort_order.upper()} "
 
-    # Pagination
-    query += f" LIMIT {page_size} OFFSET {offset} "
+    # Pagination: one extra row tells us whether another page exists
+    query += " LIMIT %(limit)s "
+    params["limit"] = page_size + 1
+    if not cursor:
+        query += " OFFSET %(offset)s "
+        params["offset"] = (page - 1) * page_size
 
     # Execute
-    posts = frappe.db.sql(query, as_dict=True)
+    posts = frappe.db.sql(query, params, as_dict=True)
+
+    next_cursor = None
+    if len(posts) > page_size:
+        posts = posts[:page_size]
+        last = posts[-1]
+        last_value = last.get(sort_key)
+        next_cursor = encode_cursor(sort_by, sort_order, "" if last_value is None else last_value, last.name)
+    images.resolve_images(posts, image_field)
 
     # Get total count for pagination info
     total_count = frappe.db.sql("""
@@ -834,11 +1194,12 @@ def get_posts_advanced(
         FROM `tabBlog Post1` 
     """)[0][0]
 
-    return {
+    return encoding.respond({
         "status": "success",
         "page": page,
         "page_size": page_size,
         "total_posts": total_count,
         "posts_returned": len(posts),
-        "posts": posts
-    }
+        "posts": posts,
+        "next_cursor": next_cursor
+    }, list_key="posts", format=format)
@@ -0,0 +1,114 @@
+import base64
+import functools
+import hashlib
+import hmac
+import inspect
+import json
+import time
+
+import frappe
+from frappe.utils.password import get_encryption_key
+
+TOKEN_HEADER = "X-Blog-Token"
+# seconds a login token stays valid, overridable with "social_media_token_ttl" in site_config.json
+DEFAULT_TOKEN_TTL = 7 * 24 * 60 * 60
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signing_key():
+    # derived from the site's encryption key, so tokens never verify on another site
+    secret = frappe.conf.get("social_media_token_secret") or get_encryption_key()
+    return hashlib.sha256(f"social_media_token:{secret}".encode()).digest()
+
+
+def _sign(payload):
+    return _b64encode(hmac.new(_signing_key(), payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(user_id, ttl=None, scope=None):
+    """
+    Signed, expiring token for a Blog User, returns (token, expires_at unix time).
+    A token issued for a `scope` only verifies for that scope, never as a login.
+    """
+    ttl = ttl or int(frappe.conf.get("social_media_token_ttl") or DEFAULT_TOKEN_TTL)
+    expires_at = int(time.time()) + ttl
+    claims = {"sub": user_id, "exp": expires_at}
+    if scope:
+        claims["scope"] = scope
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}", expires_at
+
+
+def verify_token(token, scope=None):
+    """The Blog User a token was issued to, or None if it is malformed, forged, expired or for another scope."""
+    if not token or token.count(".") != 1:
+        return None
+
+    payload, signature = token.split(".")
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+
+    if not isinstance(claims, dict) or int(claims.get("exp") or 0) < time.time():
+        return None
+    if claims.get("scope") != scope:
+        return None
+    return claims.get("sub")
+
+
+def get_request_token():
+    """Token sent with the current request, as the X-Blog-Token header or a `token` form field."""
+    header = frappe.get_request_header(TOKEN_HEADER) if getattr(frappe.local, "request", None) else None
+    return header or (getattr(frappe.local, "form_dict", None) or {}).get("token")
+
+
+def authenticated(param="user_id"):
+    """
+    Resolve the calling Blog User from a login token (X-Blog-Token header or
+    `token` argument) and pass it to the endpoint as `param`. A `param` value
+    sent by the client must match the token's user.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        accepts_any = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in signature.parameters.values())
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # frappe.call passes only the arguments fn declares, so `token` is also read from the request
+            user_id = verify_token(kwargs.pop("token", None) or get_request_token())
+            if not user_id:
+                return {
+                    "status": "error",
+                    "status_code": 401,
+                    "message": "Invalid or expired token, please login again"
+                }
+
+            claimed = kwargs.get(param)
+            if claimed and claimed != user_id:
+                return {
+                    "status": "error",
+                    "status_code": 403,
+                    "message": "Access Denied: token does not belong to this user"
+                }
+
+            kwargs[param] = user_id
+            # Frappe passes every form field to a **kwargs wrapper, keep only what fn accepts
+            if not accepts_any:
+                kwargs = {k: v for k, v in kwargs.items() if k in signature.parameters}
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
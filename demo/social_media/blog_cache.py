@@ -0,0 +1,167 @@
+import hashlib
+
+import frappe
+
+from demo.social_media.search import build_match_query
+
+# Rendered /blogs listing context, one cache entry per page
+BLOG_LIST_CACHE_PREFIX = "social_media:blog_list:"
+BLOG_LIST_PAGE_SIZE = 20
+# Deeper pages are read from the database every time, so crawlers cannot fill the cache
+BLOG_LIST_MAX_CACHED_PAGE = 50
+BLOG_LIST_TTL = 10 * 60
+
+# /blogs/<route> detail context, including negative entries for unknown routes
+BLOG_ROUTE_CACHE_PREFIX = "social_media:blog_route:"
+BLOG_ROUTE_MISS_TTL = 5 * 60
+# longest value the Blog Post2.route column can hold
+MAX_ROUTE_LENGTH = 140
+
+# get_published_blogs results per (search, page, page_size), short lived
+PUBLISHED_BLOGS_CACHE_PREFIX = "social_media:published_blogs:"
+PUBLISHED_BLOGS_TTL = 60
+
+
+def _get_version(prefix):
+    # Cache entries under `prefix` carry this number in their key. Bumping it
+    # orphans every entry at once, they expire on their TTL, which avoids the
+    # KEYS scan of delete_keys on every save. Plain Redis commands, see trending._key.
+    redis = frappe.cache()
+    return int(redis.get(redis.make_key(f"{prefix}version")) or 0)
+
+
+def _bump_version(prefix):
+    redis = frappe.cache()
+    redis.incr(redis.make_key(f"{prefix}version"))
+
+
+def _query_blog_list_page(page):
+    blogs = frappe.get_all(
+        "Blog Post2",
+        filters={"status": "Published"},
+        fields=["title", "route", "author", "published_on", "preview"],
+        order_by="published_on desc, name desc",
+        limit_start=(page - 1) * BLOG_LIST_PAGE_SIZE,
+        limit_page_length=BLOG_LIST_PAGE_SIZE + 1
+    )
+    return {"blogs": blogs[:BLOG_LIST_PAGE_SIZE], "has_next": len(blogs) > BLOG_LIST_PAGE_SIZE}
+
+
+def get_blog_list_page(page):
+    """Published blogs for one page of the /blogs listing, the first BLOG_LIST_MAX_CACHED_PAGE pages from cache."""
+    if page > BLOG_LIST_MAX_CACHED_PAGE:
+        return _query_blog_list_page(page)
+
+    cache = frappe.cache()
+    key = f"{BLOG_LIST_CACHE_PREFIX}{_get_version(BLOG_LIST_CACHE_PREFIX)}:{page}"
+    listing = cache.get_value(key)
+    if listing is None:
+        listing = _query_blog_list_page(page)
+        # pages past the end are cheap to recompute and would only grow the cache
+        if listing["blogs"]:
+            cache.set_value(key, listing, expires_in_sec=BLOG_LIST_TTL)
+    return listing
+
+
+def clear_blog_list_cache():
+    _bump_version(BLOG_LIST_CACHE_PREFIX)
+
+
+def get_published_blogs_page(search=None, page=1, page_size=BLOG_LIST_PAGE_SIZE):
+    """Published blogs with their author's username and city, newest first."""
+    search = (search or "").strip().lower()
+    search_key = hashlib.md5(search.encode("utf-8")).hexdigest() if search else ""
+    version = _get_version(PUBLISHED_BLOGS_CACHE_PREFIX)
+    key = f"{PUBLISHED_BLOGS_CACHE_PREFIX}{version}:{page}:{page_size}:{search_key}"
+
+    cache = frappe.cache()
+    blogs = cache.get_value(key)
+    if blogs is not None:
+        return blogs
+
+    search_query, params = build_match_query("Blog Post2", search) if search else (None, {})
+    if search and not search_query:
+        # only stop words or one-letter terms, nothing can match
+        return []
+    search_join = f"INNER JOIN ({search_query}) sr ON sr.reference_name = bp.name" if search_query else ""
+    params.update(limit=page_size, offset=(page - 1) * page_size)
+
+    blogs = frappe.db.sql(f"""
+        SELECT
+            bp.name, bp.title, bp.content, bp.author, bp.published_on, bp.route,
+            IFNULL(bu.username, 'Unknown') AS author_name,
+            IFNULL(bu.city, '') AS author_city
+        FROM `tabBlog Post2` bp
+        {search_join}
+        LEFT JOIN `tabBlog User2` bu ON bu.name = bp.author
+        WHERE bp.status = 'Published'
+        ORDER BY bp.published_on DESC, bp.name DESC
+        LIMIT %(limit)s OFFSET %(offset)s
+    """, params, as_dict=True)
+
+    cache.set_value(key, blogs, expires_in_sec=PUBLISHED_BLOGS_TTL)
+    return blogs
+
+
+def clear_published_blogs_cache():
+    _bump_version(PUBLISHED_BLOGS_CACHE_PREFIX)
+
+
+def get_blog_by_route(route):
+    """
+    {"blog", "author_name", "author_city"} for a published route, or {"blog": None}.
+    Misses are cached too (for BLOG_ROUTE_MISS_TTL) so unknown URLs skip the database.
+    """
+    if not route or len(route) > MAX_ROUTE_LENGTH:
+        return {"blog": None}
+
+    cache = frappe.cache()
+    key = f"{BLOG_ROUTE_CACHE_PREFIX}{route}"
+    entry = cache.get_value(key)
+    if entry is not None:
+        return entry
+
+    blog = frappe.db.sql("""
+        SELECT
+            bp.name, bp.title, bp.content, bp.author, bp.published_on, bp.route,
+            bu.username AS author_name, bu.city AS author_city
+        FROM `tabBlog Post2` bp
+        LEFT JOIN `tabBlog User2` bu ON bu.name = bp.author
+        WHERE bp.route = %(route)s AND bp.status = 'Published'
+        LIMIT 1
+    """, {"route": route}, as_dict=True)
+
+    if not blog:
+        entry = {"blog": None}
+        cache.set_value(key, entry, expires_in_sec=BLOG_ROUTE_MISS_TTL)
+        return entry
+
+    blog = blog[0]
+    entry = {
+        "blog": blog,
+        "author_name": blog.pop("author_name") or "Unknown",
+        "author_city": blog.pop("author_city") or ""
+    }
+    cache.set_value(key, entry)
+    return entry
+
+
+def clear_blog_route_cache(routes):
+    keys = [f"{BLOG_ROUTE_CACHE_PREFIX}{route}" for route in set(routes) if route]
+    if keys:
+        frappe.cache().delete_value(keys)
+
+
+# doc_events: Blog Post2 on_update / on_trash
+def on_blog_post_change(doc, method=None):
+    clear_blog_list_cache()
+    clear_published_blogs_cache()
+
+    before = doc.get_doc_before_save()
+    clear_blog_route_cache([doc.route, before.route if before else None])
+
+
+# doc_events: Blog User2 on_update / on_trash
+def on_blog_author_change(doc, method=None):
+    clear_published_blogs_cache()
+    clear_blog_route_cache(frappe.get_all("Blog Post2", filters={"author": doc.name}, pluck="route"))
@@ -0,0 +1,85 @@
+import frappe
+from frappe.utils import cint, now_datetime, nowdate
+
+BULK_MAX_ITEMS = 1000
+BULK_INSERT_CHUNK_SIZE = 500
+
+
+def parse_items(items):
+    """Parse a JSON array argument of a bulk endpoint, enforcing BULK_MAX_ITEMS."""
+    if isinstance(items, str):
+        items = frappe.parse_json(items)
+    if not isinstance(items, list):
+        frappe.throw("Expected a JSON array")
+    if len(items) > BULK_MAX_ITEMS:
+        frappe.throw(f"At most {BULK_MAX_ITEMS} items can be sent in one request")
+    return items
+
+
+# Names of `doctype` records that exist among `names`, in one query
+def existing_names(doctype, names):
+    names = list({n for n in names if n})
+    if not names:
+        return set()
+    return set(frappe.get_all(doctype, filters={"name": ["in", names]}, pluck="name"))
+
+
+def reserve_names(series, digits, count):
+    """
+    Allocate `count` consecutive names from a naming series in one update,
+    as make_autoname would for "<series>.####", one name at a time.
+    """
+    current = frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", series)
+    if current and current[0][0] is not None:
+        start = cint(current[0][0]) + 1
+        frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name` = %s", (count, series))
+    else:
+        start = 1
+        frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (series, count))
+
+    return [f"{series}{str(n).zfill(digits)}" for n in range(start, start + count)]
+
+
+def insert_rows(doctype, series, rows, ignore_duplicates=False):
+    """
+    Insert plain dicts as `doctype` records with batched INSERT statements.
+    Controller hooks do not run, callers apply their side effects themselves.
+    Returns the generated names in the order of `rows`.
+    """
+    if not rows:
+        return []
+
+    names = reserve_names(series, 4, len(rows))
+    timestamp = now_datetime()
+    user = frappe.session.user
+    fieldnames = list(rows[0])
+    fields = ["name", "owner", "modified_by", "creation", "modified", "docstatus", *fieldnames]
+    values = [
+        (name, user, user, timestamp, timestamp, 0, *(row[f] for f in fieldnames))
+        for name, row in zip(names, rows, strict=True)
+    ]
+    frappe.db.bulk_insert(
+        doctype, fields, values, ignore_duplicates=ignore_duplicates, chunk_size=BULK_INSERT_CHUNK_SIZE
+    )
+    return names
+
+
+def post_row(item):
+    return {
+        "title": item.get("title"),
+        "description": item.get("description"),
+        "content": item.get("content"),
+        "category": item.get("category"),
+        "user": item.get("user"),
+        "image": item.get("image"),
+        "creation_date": nowdate(),
+        "like_count": 0
+    }
+
+
+def like_row(item):
+    return {
+        "post": item.get("post"),
+        "user": item.get("user"),
+        "liked_on": now_datetime()
+    }
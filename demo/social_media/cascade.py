@@ -0,0 +1,107 @@
+import frappe
+
+from demo.social_media import loader, timelines, trending
+from demo.social_media.search import remove_documents
+from demo.social_media.uploads import release_images
+from demo.social_media.user_summary import invalidate_users
+
+DELETE_CHUNK_SIZE = 1000
+
+
+def _chunks(values, size=DELETE_CHUNK_SIZE):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield tuple(values[i:i + size])
+
+
+def _delete_where_in(doctype, fieldname, values):
+    """Set-based delete of rows whose `fieldname` is in `values`, returns the number of rows removed."""
+    params = {"values": values}
+    count = frappe.db.sql(
+        f"SELECT COUNT(*) FROM `tab{doctype}` WHERE `{fieldname}` IN %(values)s", params
+    )[0][0]
+    if count:
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE `{fieldname}` IN %(values)s", params)
+    return count
+
+
+def _delete_attachments(doctype, names):
+    # File.on_trash removes the file from disk, so these still go through delete_doc
+    files = frappe.get_all(
+        "File",
+        filters={"attached_to_doctype": doctype, "attached_to_name": ["in", list(names)]},
+        pluck="name"
+    )
+    for file_name in files:
+        frappe.delete_doc("File", file_name, ignore_permissions=True)
+    return len(files)
+
+
+def delete_posts(post_names):
+    """
+    Delete Blog Post1 records with their likes, attachments, search index rows
+    and image references, DELETE_CHUNK_SIZE posts per statement. Returns the
+    deleted row counts.
+    """
+    deleted = {"posts": 0, "likes": 0, "files": 0}
+    for names in _chunks(post_names):
+        posts = frappe.get_all("Blog Post1", filters={"name": ["in", list(names)]}, fields=["name", "user", "category", "image"])
+        deleted["likes"] += _delete_where_in("Blog Like1", "post", names)
+        deleted["files"] += _delete_attachments("Blog Post1", names)
+        remove_documents("Blog Post1", names)
+        deleted["posts"] += _delete_where_in("Blog Post1", "name", names)
+        loader.forget("Blog Post1", names)
+        release_images([p.image for p in posts])
+        timelines.remove_posts(posts)
+        trending.remove_posts(posts)
+        invalidate_users([p.user for p in posts])
+
+    return deleted
+
+
+def delete_user_likes(user_id):
+    """Delete every like a user gave, keeping like_count on the liked posts consistent."""
+    # Owners of the liked posts, whose cached summaries include these likes
+    owners = frappe.db.sql_list("""
+        SELECT DISTINCT bp.user
+        FROM `tabBlog Like1` bl
+        INNER JOIN `tabBlog Post1` bp ON bp.name = bl.post
+        WHERE bl.user = %(user)s
+    """, {"user": user_id})
+    liked_posts = frappe.get_all("Blog Like1", filters={"user": user_id}, pluck="post", distinct=True)
+
+    frappe.db.sql("""
+        UPDATE `tabBlog Post1` bp
+        INNER JOIN (
+            SELECT post, COUNT(*) AS total
+            FROM `tabBlog Like1`
+            WHERE user = %(user)s
+            GROUP BY post
+        ) bl ON bl.post = bp.name
+        SET bp.like_count = GREATEST(IFNULL(bp.like_count, 0) - bl.total, 0)
+    """, {"user": user_id})
+
+    deleted = 0
+    while True:
+        likes = frappe.get_all(
+            "Blog Like1", filters={"user": user_id}, pluck="name", limit_page_length=DELETE_CHUNK_SIZE
+        )
+        if not likes:
+            break
+        deleted += _delete_where_in("Blog Like1", "name", tuple(likes))
+
+    invalidate_users(owners)
+    trending.refresh_posts(liked_posts)
+    return deleted
+
+
+def delete_user(user_id):
+    """Delete a Blog User with all their posts, the likes on those posts and the likes they gave."""
+    posts = frappe.get_all("Blog Post1", filters={"user": user_id}, pluck="name")
+    deleted = delete_posts(posts)
+    deleted["likes"] += delete_user_likes(user_id)
+
+    frappe.delete_doc("Blog User", user_id, ignore_permissions=True)
+    loader.forget("Blog User", user_id)
+    deleted["users"] = 1
+    return deleted
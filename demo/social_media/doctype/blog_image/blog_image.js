@@ -0,0 +1,8 @@
+// Copyright (c) 2026, demo and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Blog Image", {
+// 	refresh(frm) {
+
+// 	},
+// });
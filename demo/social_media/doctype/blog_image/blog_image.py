@@ -0,0 +1,8 @@
+# Copyright (c) 2026, demo and contributors
+# For license information, please see license.txt
+
+from frappe.model.document import Document
+
+
+class BlogImage(Document):
+	pass
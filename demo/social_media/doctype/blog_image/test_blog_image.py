@@ -0,0 +1,119 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import io
+import os
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from demo.social_media import uploads
+
+
+def make_png():
+	"""PNG of random pixels, so each test stores content of its own."""
+	buffer = io.BytesIO()
+	Image.frombytes("RGB", (8, 8), os.urandom(8 * 8 * 3)).save(buffer, "PNG")
+	return buffer.getvalue()
+
+
+def store(content):
+	return uploads.save_image(uploads.receive_image(FileStorage(stream=io.BytesIO(content), filename="photo.png")))
+
+
+def get_path(file_url):
+	return frappe.get_site_path("public", file_url.lstrip("/"))
+
+
+def get_ref_count(file_url):
+	return frappe.db.get_value("Blog Image", {"file_url": file_url}, "ref_count")
+
+
+class TestBlogImage(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.user = frappe.get_doc(
+			{
+				"doctype": "Blog User",
+				"full_name": "Image Tester",
+				"email": f"image-{frappe.generate_hash(length=6)}@example.com",
+				"password": "Password123",
+				"gender": "Other",
+			}
+		).insert()
+
+	def setUp(self):
+		self.first = store(make_png())
+		self.second = store(make_png())
+
+	def tearDown(self):
+		# files of this test's rows, which the rollback after the test class leaves on disk
+		for file_url in (self.first, self.second):
+			if os.path.exists(get_path(file_url)):
+				os.remove(get_path(file_url))
+
+	def make_post(self, image):
+		return frappe.get_doc(
+			{
+				"doctype": "Blog Post1",
+				"title": "Image post",
+				"description": "description",
+				"content": "<p>content</p>",
+				"user": self.user.name,
+				"image": image,
+			}
+		).insert()
+
+	def test_same_content_is_stored_once(self):
+		content = make_png()
+		file_url = store(content)
+		try:
+			self.assertEqual(store(content), file_url)
+			self.assertEqual(frappe.db.count("Blog Image", {"file_url": file_url}), 1)
+			self.assertTrue(os.path.exists(get_path(file_url)))
+			# the second upload's temporary file is discarded
+			files_path = frappe.get_site_path("public", "files")
+			self.assertEqual([f for f in os.listdir(files_path) if f.startswith(".upload-")], [])
+		finally:
+			os.remove(get_path(file_url))
+
+	def test_posts_acquire_their_image(self):
+		self.assertEqual(get_ref_count(self.first), 0)
+		post = self.make_post(self.first)
+		self.make_post(self.first)
+		self.assertEqual(get_ref_count(self.first), 2)
+
+		post.image = self.second
+		post.save()
+		self.assertEqual(get_ref_count(self.first), 1)
+		self.assertEqual(get_ref_count(self.second), 1)
+
+	def test_trash_releases_the_image(self):
+		kept = self.make_post(self.first)
+		removed = self.make_post(self.first)
+		removed.delete()
+		self.assertEqual(get_ref_count(self.first), 1)
+
+		kept.delete()
+		self.assertFalse(frappe.db.exists("Blog Image", {"file_url": self.first}))
+		self.assertFalse(frappe.db.exists("File", {"file_url": self.first}))
+		# the file itself only goes once the deletes are committed
+		self.assertTrue(os.path.exists(get_path(self.first)))
+		uploads._remove_unused_files([self.first])
+		self.assertFalse(os.path.exists(get_path(self.first)))
+
+	def test_referenced_images_are_kept(self):
+		self.make_post(self.second)
+		uploads.release_images([self.first])
+		uploads._remove_unused_files([self.first, self.second])
+		self.assertTrue(os.path.exists(get_path(self.second)))
+		self.assertEqual(get_ref_count(self.second), 1)
+
+	def test_only_stored_images_can_be_locked(self):
+		self.assertEqual(
+			uploads.lock_stored_images([self.first, "/files/elsewhere.png", None]),
+			{self.first},
+		)
@@ -1,9 +1,44 @@
 # Copyright (c) 2025, demo and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from demo.social_media.doctype.blog_post1.blog_post1 import update_like_count
+
 
 class BlogLike1(Document):
-	pass
+	def after_insert(self):
+		update_like_count(self.post, 1)
+
+	def on_trash(self):
+		update_like_count(self.post, -1)
+
+
+def on_doctype_update():
+	# one like per (post, user); also serves every lookup by post
+	frappe.db.add_unique("Blog Like1", ["post", "user"], constraint_name="unique_post_user")
+	# a user's likes, newest first (get_user_liked_posts, cascades)
+	frappe.db.add_index("Blog Like1", ["user", "creation"])
+
+
+def get_like(post, user):
+	return frappe.db.get_value("Blog Like1", {"post": post, "user": user}, "name")
+
+
+def get_or_create_like(post, user):
+	"""Return (like name, created) for a (post, user) pair, inserting the like only if it is missing."""
+	like = get_like(post, user)
+	if like:
+		return like, False
+
+	frappe.db.savepoint("blog_like_insert")
+	try:
+		like_doc = frappe.get_doc({"doctype": "Blog Like1", "post": post, "user": user})
+		like_doc.insert(ignore_permissions=True)
+		return like_doc.name, True
+	except (frappe.UniqueValidationError, frappe.DuplicateEntryError):
+		# a concurrent request inserted the same like first
+		frappe.db.rollback(save_point="blog_like_insert")
+		frappe.clear_last_message()
+		return get_like(post, user), False
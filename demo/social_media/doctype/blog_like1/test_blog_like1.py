@@ -1,9 +1,42 @@
 # Copyright (c) 2025, demo and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from demo.patches.v1_0 import remove_duplicate_likes
+from demo.social_media import bulk
+from demo.social_media.doctype.blog_like1 import blog_like1
+from demo.social_media.user_summary import SUMMARY_KEY_PREFIX
 
-class TestBlogLike1(FrappeTestCase):
-	pass
+
+class TestRemoveDuplicateLikes(FrappeTestCase):
+	"""The patch runs before the unique index exists, so the index is dropped for these tests."""
+
+	def setUp(self):
+		# DDL commits implicitly; rows inserted after it are rolled back in tearDown
+		frappe.db.sql_ddl("ALTER TABLE `tabBlog Like1` DROP INDEX unique_post_user")
+
+	def tearDown(self):
+		frappe.db.rollback()
+		blog_like1.on_doctype_update()
+
+	def test_one_like_per_post_and_user(self):
+		first, second = bulk.insert_rows(
+			"Blog Post1", "POST", [bulk.post_row({"title": f"Duplicate likes {i}"}) for i in range(2)]
+		)
+		pairs = [(first, "BU-dup-1")] * 3 + [(first, "BU-dup-2"), (second, "BU-dup-1"), (second, "BU-dup-1")]
+		likes = bulk.insert_rows("Blog Like1", "LIKE", [bulk.like_row({"post": p, "user": u}) for p, u in pairs])
+		summary_key = f"{SUMMARY_KEY_PREFIX}BU-dup-owner"
+		frappe.cache().hset(summary_key, "posts", "[]")
+
+		remove_duplicate_likes.execute()
+
+		# the earliest like of each pair is kept, equal creation times fall back to the name
+		self.assertEqual(
+			sorted(frappe.get_all("Blog Like1", filters={"post": ["in", [first, second]]}, pluck="name")),
+			sorted([likes[0], likes[3], likes[4]]),
+		)
+		self.assertEqual(frappe.db.get_value("Blog Post1", first, "like_count"), 2)
+		self.assertEqual(frappe.db.get_value("Blog Post1", second, "like_count"), 1)
+		self.assertFalse(frappe.cache().exists(summary_key))
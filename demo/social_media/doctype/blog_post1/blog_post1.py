@@ -1,9 +1,56 @@
 # Copyright (c) 2025, demo and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class BlogPost1(Document):
-	pass
+	def before_save(self):
+		# update_like_count is the only writer of like_count. A document loaded before
+		# a slow step (an image upload) would write back a stale count, so take the
+		# stored one; the row stays locked until commit.
+		if not self.is_new():
+			self.like_count = frappe.db.get_value(self.doctype, self.name, "like_count", for_update=True) or 0
+
+
+def on_doctype_update():
+	# a user's posts, newest first (profiles, exports, cascades)
+	frappe.db.add_index("Blog Post1", ["user", "creation"])
+	# a category's posts, newest first (category timelines)
+	frappe.db.add_index("Blog Post1", ["category", "creation"])
+	# keyset paging of get_posts_advanced sorted by title or likes, name breaks ties
+	frappe.db.add_index("Blog Post1", ["title", "name"])
+	frappe.db.add_index("Blog Post1", ["like_count", "name"])
+
+
+def update_like_count(post, delta):
+	"""Atomically shift the stored like counter of a post by `delta`."""
+	frappe.db.sql(
+		"""
+		UPDATE `tabBlog Post1`
+		SET like_count = GREATEST(IFNULL(like_count, 0) + %(delta)s, 0)
+		WHERE name = %(post)s
+		""",
+		{"post": post, "delta": delta},
+	)
+
+
+def repair_like_counts(posts=None):
+	"""Recount `like_count` from Blog Like1 rows, for the given posts or for every post."""
+	condition = ""
+	params = {}
+	if posts:
+		condition = "WHERE bp.name IN %(posts)s"
+		params["posts"] = tuple(posts)
+
+	frappe.db.sql(
+		f"""
+		UPDATE `tabBlog Post1` bp
+		SET bp.like_count = (
+			SELECT COUNT(*) FROM `tabBlog Like1` bl WHERE bl.post = bp.name
+		)
+		{condition}
+		""",
+		params,
+	)
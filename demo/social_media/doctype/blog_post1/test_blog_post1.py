@@ -1,9 +1,81 @@
 # Copyright (c) 2025, demo and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from demo.social_media import bulk
+from demo.social_media.api import get_posts_advanced
+from demo.social_media.doctype.blog_post1.blog_post1 import update_like_count
+
+PAGE_SIZE = 4
+
 
 class TestBlogPost1(FrappeTestCase):
-	pass
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.user = frappe.get_doc(
+			{
+				"doctype": "Blog User",
+				"full_name": "Paging Tester",
+				"email": f"paging-{frappe.generate_hash(length=6)}@example.com",
+				"password": "Password123",
+				"gender": "Other",
+			}
+		).insert()
+		cls.posts = cls.make_posts(range(0, 20, 2))
+
+	@classmethod
+	def make_posts(cls, numbers):
+		# likes repeat every 3 posts so name has to break ties
+		return bulk.insert_rows(
+			"Blog Post1",
+			"POST",
+			[
+				{**bulk.post_row({"title": f"Paging post {i:02d}", "user": cls.user.name}), "like_count": i % 3}
+				for i in numbers
+			],
+		)
+
+	def get_all_pages(self, sort_by, sort_order, between_pages=None):
+		"""Follow next_cursor to the end, calling `between_pages` after the first page."""
+		names = []
+		cursor = None
+		while True:
+			response = get_posts_advanced(
+				user=self.user.name, sort_by=sort_by, sort_order=sort_order, page_size=PAGE_SIZE, cursor=cursor
+			)
+			names.extend(post.name for post in response["posts"])
+			cursor = response["next_cursor"]
+			if not cursor:
+				return names
+			if between_pages:
+				between_pages()
+				between_pages = None
+
+	def test_cursor_pages_survive_inserts(self):
+		for sort_by in ("creation", "title", "total_likes", "name"):
+			for sort_order in ("asc", "desc"):
+				with self.subTest(sort_by=sort_by, sort_order=sort_order):
+					inserted = []
+					names = self.get_all_pages(
+						sort_by, sort_order, lambda: inserted.extend(self.make_posts(range(1, 20, 4)))
+					)
+					self.assertEqual(len(names), len(set(names)), "a row was served twice")
+					self.assertTrue(set(self.posts) <= set(names), "a row was skipped")
+					self.assertTrue(set(names) <= set(self.posts) | set(inserted))
+					frappe.db.delete("Blog Post1", {"name": ["in", inserted]})
+
+	def test_cursor_pages_follow_the_sort(self):
+		names = self.get_all_pages("total_likes", "desc")
+		rows = frappe.get_all("Blog Post1", filters={"name": ["in", names]}, fields=["name", "like_count"])
+		like_counts = {row.name: row.like_count for row in rows}
+		self.assertEqual(names, sorted(names, key=lambda name: (like_counts[name], name), reverse=True))
+
+	def test_save_keeps_likes_counted_meanwhile(self):
+		post = frappe.get_doc("Blog Post1", self.posts[0])
+		update_like_count(post.name, 2)
+		post.title = "Paging post renamed"
+		post.save()
+		self.assertEqual(frappe.db.get_value("Blog Post1", post.name, "like_count"), 2)
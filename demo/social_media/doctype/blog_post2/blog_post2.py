@@ -1,31 +1,52 @@
 # Copyright (c) 2025, demo and contributors
 # For license information, please see license.txt
+import re
+
 import frappe
 from frappe.model.document import Document
 
+from demo.social_media.slugs import MAX_ROUTE_ATTEMPTS, allocate_route, is_route_conflict, make_slug, next_suffix
+
+PREVIEW_LENGTH = 200
+
+
+# Plain-text teaser shown on the /blogs listing
+def make_preview(content):
+    text = re.sub(r"<[^>]*>", "", content or "")
+    return text[:PREVIEW_LENGTH] + ("..." if len(text) > PREVIEW_LENGTH else "")
+
+
 class BlogPost2(Document):
     def validate(self):
-        # Prevent duplicate titles
-        if frappe.db.exists("Blog Post2", {"title": self.title, "name": ["!=", self.name]}):
-            frappe.throw("A blog post with this title already exists.")
+        # Duplicate titles and routes are rejected by their unique indexes
+
+        # Clean route from the title (spaces/underscores → dashes), suffixed if already taken
+        self.route = allocate_route(self)
 
-        # Auto-generate clean route (replace spaces/underscores → dashes)
-        new_route = frappe.scrub(self.title).replace("_", "-")
+        self.preview = make_preview(self.content)
 
-        # If route not set or title changed, update it
-        if not self.route or self.route != new_route:
-            self.route = new_route
+    def db_insert(self, *args, **kwargs):
+        return self._write_with_route_retry(super().db_insert, *args, **kwargs)
 
-        # Ensure route is unique
-        existing = frappe.db.exists("Blog Post2", {"route": self.route, "name": ["!=", self.name]})
-        if existing:
-            # Add a numeric suffix if duplicate route exists
-            count = frappe.db.count("Blog Post2", {"route": ["like", f"{self.route}%"]})
-            self.route = f"{self.route}-{count + 1}"
+    def db_update(self, *args, **kwargs):
+        return self._write_with_route_retry(super().db_update, *args, **kwargs)
 
-    def before_insert(self):
-        # Just ensure route exists before insert
-        if not self.route:
-            self.route = frappe.scrub(self.title).replace("_", "-")
+    def _write_with_route_retry(self, write, *args, **kwargs):
+        # A concurrent save can take the route between validate and the write;
+        # the unique index catches it and we retry with the next suffix
+        for attempt in range(MAX_ROUTE_ATTEMPTS):
+            frappe.db.savepoint("blog_post2_route")
+            try:
+                return write(*args, **kwargs)
+            except frappe.UniqueValidationError as e:
+                if not is_route_conflict(e) or attempt == MAX_ROUTE_ATTEMPTS - 1:
+                    raise
+                frappe.db.rollback(save_point="blog_post2_route")
+                frappe.clear_last_message()
+                base = make_slug(self.title)
+                self.route = f"{base}-{next_suffix(base)}"
 
 
+def on_doctype_update():
+    # published listing ordered by date
+    frappe.db.add_index("Blog Post2", ["status", "published_on"])
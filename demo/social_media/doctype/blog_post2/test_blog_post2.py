@@ -1,9 +1,78 @@
 # Copyright (c) 2025, demo and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from demo.social_media import blog_cache
 
 
 class TestBlogPost2(FrappeTestCase):
-	pass
+	def make_blog(self, title, **fields):
+		return frappe.get_doc(
+			{"doctype": "Blog Post2", "title": title, "content": "<p>content</p>", **fields}
+		).insert()
+
+	def test_colliding_slugs_get_distinct_suffixes(self):
+		suffix = frappe.generate_hash(length=6)
+		first = self.make_blog(f"Slug Test {suffix}")
+		second = self.make_blog(f"Slug-Test {suffix}")
+		third = self.make_blog(f"Slug_Test {suffix}")
+
+		routes = [first.route, second.route, third.route]
+		self.assertEqual(first.route, f"slug-test-{suffix}")
+		self.assertEqual(len(set(routes)), 3)
+		self.assertTrue(all(route.startswith(f"slug-test-{suffix}") for route in routes))
+
+	def test_resave_keeps_route(self):
+		blog = self.make_blog(f"Resave {frappe.generate_hash(length=6)}")
+		route = blog.route
+
+		blog.content = "<p>edited</p>"
+		blog.save()
+
+		self.assertEqual(blog.route, route)
+
+	def test_blog_list_pages_past_the_cached_ones(self):
+		# published in the future, so they lead the listing
+		blogs = [
+			self.make_blog(
+				f"Listing {i} {frappe.generate_hash(length=6)}",
+				status="Published",
+				published_on=add_days(nowdate(), 1000 - i),
+			)
+			for i in range(5)
+		]
+		routes = [blog.route for blog in blogs]
+		with (
+			patch.object(blog_cache, "BLOG_LIST_PAGE_SIZE", 2),
+			patch.object(blog_cache, "BLOG_LIST_MAX_CACHED_PAGE", 1),
+		):
+			first, second = blog_cache.get_blog_list_page(1), blog_cache.get_blog_list_page(2)
+			self.assertEqual([b.route for b in first["blogs"] + second["blogs"]], routes[:4])
+			self.assertTrue(second["has_next"])
+
+	def test_saving_a_blog_refreshes_the_listing(self):
+		blog = self.make_blog(
+			f"Listed {frappe.generate_hash(length=6)}",
+			status="Published",
+			published_on=add_days(nowdate(), 2000),
+		)
+		self.assertEqual(blog_cache.get_blog_list_page(1)["blogs"][0].route, blog.route)
+
+		blog.title = "Listed and renamed"
+		blog.save()
+		self.assertEqual(blog_cache.get_blog_list_page(1)["blogs"][0].title, "Listed and renamed")
+
+	def test_saving_an_author_refreshes_the_published_blogs(self):
+		suffix = frappe.generate_hash(length=6)
+		author = frappe.get_doc({"doctype": "Blog User2", "username": f"author-{suffix}"}).insert()
+		self.make_blog(f"Authored {suffix}", author=author.name, status="Published", published_on=nowdate())
+		self.assertEqual(blog_cache.get_published_blogs_page(f"authored {suffix}")[0].author_city, "")
+
+		author.city = "Pune"
+		author.save()
+		self.assertEqual(blog_cache.get_published_blogs_page(f"authored {suffix}")[0].author_city, "Pune")
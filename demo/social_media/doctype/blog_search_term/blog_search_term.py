@@ -0,0 +1,14 @@
+# Copyright (c) 2026, demo and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class BlogSearchTerm(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Blog Search Term", ["reference_doctype", "term"])
+	frappe.db.add_index("Blog Search Term", ["reference_doctype", "reference_name"])
@@ -0,0 +1,98 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from demo.social_media.search import build_match_query, get_term_weights, tokenize
+
+
+def search(text):
+	"""Names of the Blog Post1 records matching `text`, most relevant first."""
+	query, params = build_match_query("Blog Post1", text)
+	if not query:
+		return []
+	rows = frappe.db.sql(f"{query} ORDER BY relevance DESC, t0.reference_name", params, as_dict=True)
+	return [row.reference_name for row in rows]
+
+
+class TestTokenize(FrappeTestCase):
+	def test_html_case_and_punctuation(self):
+		self.assertEqual(tokenize("<p>Hello, <b>World</b>!</p> caf&eacute;"), ["hello", "world", "café"])
+
+	def test_stop_words_and_short_tokens_are_dropped(self):
+		self.assertEqual(tokenize("The cat is on a mat, x y"), ["cat", "mat"])
+		self.assertEqual(tokenize(None), [])
+
+	def test_long_tokens_are_truncated(self):
+		self.assertEqual(tokenize("a" * 100), ["a" * 64])
+
+	def test_term_weights_follow_the_fields(self):
+		weights = get_term_weights("Blog Post1", {"title": "Garden", "description": "garden tips", "content": "tips"})
+		self.assertEqual(weights, {"garden": 7, "tips": 3})
+
+	def test_no_indexable_terms_build_no_query(self):
+		self.assertEqual(build_match_query("Blog Post1", "the a x"), (None, {}))
+
+
+class TestBlogSearchTerm(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.user = frappe.get_doc(
+			{
+				"doctype": "Blog User",
+				"full_name": "Search Tester",
+				"email": f"search-{frappe.generate_hash(length=6)}@example.com",
+				"password": "Password123",
+				"gender": "Other",
+			}
+		).insert()
+
+	def setUp(self):
+		# a word of each test's own keeps other records out of the results
+		self.word = f"srch{frappe.generate_hash(length=8)}"
+
+	def make_post(self, title, description="description", content="<p>content</p>"):
+		return frappe.get_doc(
+			{
+				"doctype": "Blog Post1",
+				"title": title,
+				"description": description,
+				"content": content,
+				"user": self.user.name,
+			}
+		).insert()
+
+	def test_terms_match_as_prefixes(self):
+		post = self.make_post(f"{self.word}ing gardens")
+		self.assertEqual(search(self.word), [post.name])
+		self.assertEqual(search(f"{self.word}ing gard"), [post.name])
+		self.assertEqual(search(f"{self.word}ingx"), [])
+
+	def test_every_term_must_match(self):
+		both = self.make_post(f"{self.word} tomatoes", content="<p>grown in pots</p>")
+		self.make_post(f"{self.word} cucumbers")
+		self.assertEqual(search(f"{self.word} tomatoes pots"), [both.name])
+		self.assertEqual(search(f"{self.word} tomatoes carrots"), [])
+
+	def test_relevance_order(self):
+		in_content = self.make_post("Weekly notes", content=f"<p>{self.word}</p>")
+		in_title = self.make_post(f"{self.word} notes")
+		as_prefix = self.make_post(f"{self.word}s notes")
+		in_description = self.make_post("Other notes", description=self.word)
+		# title over description over content, an exact term counts twice a prefix match
+		self.assertEqual(search(self.word), [in_title.name, as_prefix.name, in_description.name, in_content.name])
+
+	def test_save_reindexes_and_delete_removes(self):
+		post = self.make_post(f"{self.word} before")
+		self.assertEqual(search(f"{self.word} before"), [post.name])
+
+		post.title = f"{self.word} after"
+		post.save()
+		self.assertEqual(search(f"{self.word} before"), [])
+		self.assertEqual(search(f"{self.word} after"), [post.name])
+
+		post.delete()
+		self.assertEqual(search(self.word), [])
+		self.assertFalse(frappe.db.exists("Blog Search Term", {"reference_name": post.name}))
@@ -1,9 +1,91 @@
 # Copyright (c) 2025, demo and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
+import requests
 from frappe.tests.utils import FrappeTestCase
 
+from demo.social_media.gender import backfill_genders, clear_cache, infer_user_gender
+
+
+class StubGenderizeResponse:
+	"""Local stand-in for a genderize.io response."""
+
+	def __init__(self, payload, status_code=200):
+		self.payload = payload
+		self.status_code = status_code
+
+	def raise_for_status(self):
+		if self.status_code >= 400:
+			raise requests.HTTPError(f"{self.status_code} Error")
+
+	def json(self):
+		return self.payload
+
 
 class TestBlogUser(FrappeTestCase):
-	pass
+	def setUp(self):
+		clear_cache()
+
+	def make_user(self, full_name="Priya Shah"):
+		return frappe.get_doc(
+			{
+				"doctype": "Blog User",
+				"full_name": full_name,
+				"email": f"{frappe.generate_hash(length=8)}@example.com",
+				"password": "Password123",
+			}
+		).insert(ignore_permissions=True)
+
+	@patch("demo.social_media.gender.requests.get")
+	def test_infer_user_gender_backfills_gender(self, get):
+		get.return_value = StubGenderizeResponse([{"name": "priya", "gender": "female", "probability": 0.98}])
+		user = self.make_user()
+
+		infer_user_gender(user.name, "Priya")
+
+		self.assertEqual(frappe.db.get_value("Blog User", user.name, "gender"), "Female")
+
+	@patch("demo.social_media.gender.time.sleep")
+	@patch("demo.social_media.gender.requests.get")
+	def test_infer_user_gender_retries_failed_requests(self, get, sleep):
+		get.side_effect = [
+			requests.ConnectionError("connection reset"),
+			StubGenderizeResponse([{"name": "priya", "gender": "female", "probability": 0.4}]),
+		]
+		user = self.make_user()
+
+		infer_user_gender(user.name, "Priya")
+
+		self.assertEqual(get.call_count, 2)
+		self.assertEqual(frappe.db.get_value("Blog User", user.name, "gender"), "Other")
+
+	@patch("demo.social_media.gender.requests.get")
+	def test_gender_lookups_are_cached(self, get):
+		get.return_value = StubGenderizeResponse([{"name": "priya", "gender": "female", "probability": 0.98}])
+		first, second = self.make_user(), self.make_user()
+
+		infer_user_gender(first.name, "Priya")
+		infer_user_gender(second.name, "priya")
+
+		self.assertEqual(get.call_count, 1)
+		self.assertEqual(frappe.db.get_value("Blog User", second.name, "gender"), "Female")
+
+	@patch("demo.social_media.gender.requests.get")
+	def test_backfill_genders_batches_distinct_names(self, get):
+		get.return_value = StubGenderizeResponse(
+			[
+				{"name": "priya", "gender": "female", "probability": 0.98},
+				{"name": "arjun", "gender": "male", "probability": 0.99},
+			]
+		)
+		users = [self.make_user("Priya Shah"), self.make_user("Priya Rao"), self.make_user("Arjun Mehta")]
+
+		backfill_genders()
+
+		self.assertEqual(get.call_count, 1)
+		self.assertEqual(
+			[frappe.db.get_value("Blog User", u.name, "gender") for u in users], ["Female", "Female", "Male"]
+		)
@@ -0,0 +1,54 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from demo.social_media import gender
+
+
+class TestGenderCache(FrappeTestCase):
+	def setUp(self):
+		gender.clear_cache()
+
+	def age(self, name, days):
+		frappe.db.set_value(
+			"Gender Cache", name, "fetched_on", add_to_date(now_datetime(), days=-days), update_modified=False
+		)
+
+	def test_answers_outlive_the_process_cache(self):
+		gender._store({"priya": ("female", 0.98), "kim": (None, 0)})
+		gender._local_cache.clear()
+
+		self.assertEqual(gender.get_cached_gender("Priya"), ("female", 0.98))
+		self.assertEqual(gender.lookup_genders(["kim"]), {"kim": (None, 0)})
+
+	def test_store_refreshes_an_answer(self):
+		gender._store({"alex": ("male", 0.55)})
+		self.age("alex", 40)
+		gender._store({"alex": ("female", 0.52)})
+
+		self.assertEqual(frappe.db.count("Gender Cache", {"name": "alex"}), 1)
+		gender._local_cache.clear()
+		self.assertEqual(gender.get_cached_gender("alex"), ("female", 0.52))
+
+	def test_expired_answers_are_not_served(self):
+		gender._store({"priya": ("female", 0.98)})
+		self.age("priya", 31)
+		gender._local_cache.clear()
+
+		self.assertIsNone(gender.get_cached_gender("priya"))
+
+	def test_prune_by_age_and_size(self):
+		gender._store({name: ("female", 0.9) for name in ("ann", "bea", "cat", "dee")})
+		self.age("ann", 31)
+		self.age("bea", 3)
+		self.age("cat", 2)
+
+		with patch.object(gender, "GENDER_CACHE_MAX_ROWS", 2):
+			gender.prune_cache()
+
+		self.assertEqual(frappe.get_all("Gender Cache", pluck="name", order_by="name"), ["cat", "dee"])
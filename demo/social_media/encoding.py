@@ -0,0 +1,143 @@
+import datetime
+import decimal
+import gzip
+import json
+
+import frappe
+
+# Response formats a list endpoint can be asked for with `format` or the Accept header
+JSON_FORMAT = "json"
+COLUMNAR_FORMAT = "columnar"
+MSGPACK_FORMAT = "msgpack"
+RESPONSE_FORMATS = (JSON_FORMAT, COLUMNAR_FORMAT, MSGPACK_FORMAT)
+
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+COLUMNAR_MIMETYPE = "application/vnd.columnar+json"
+
+# Smaller bodies fit a packet or two anyway, compressing them only costs CPU
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def get_response_format(format=None):
+    """Format asked for by the `format` argument, else by the Accept header, else json."""
+    if format:
+        format = str(format).strip().lower()
+        if format not in RESPONSE_FORMATS:
+            frappe.throw(f"Invalid format, use one of: {', '.join(RESPONSE_FORMATS)}")
+        return format
+
+    accept = _request_header("Accept")
+    if any(mimetype in accept for mimetype in MSGPACK_MIMETYPES):
+        return MSGPACK_FORMAT
+    if COLUMNAR_MIMETYPE in accept:
+        return COLUMNAR_FORMAT
+    return JSON_FORMAT
+
+
+def to_columns(rows):
+    """[{"a": 1, "b": 2}, {"a": 3, "b": 4}] -> {"a": [1, 3], "b": [2, 4]}, every key sent once."""
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, [])
+    for row in rows:
+        for key, values in columns.items():
+            values.append(row.get(key))
+    return columns
+
+
+def _request_header(name):
+    request = getattr(frappe.local, "request", None)
+    return (request.headers.get(name) or "").lower() if request else ""
+
+
+def get_content_encoding():
+    """Best encoding the client accepts: br when brotli is installed, then gzip, else None."""
+    accepted = {}
+    for part in _request_header("Accept-Encoding").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        if coding:
+            accepted[coding] = quality
+
+    def allows(coding):
+        return accepted.get(coding, accepted.get("*", 0)) > 0
+
+    if allows("br") and _brotli():
+        return "br"
+    if allows("gzip"):
+        return "gzip"
+    return None
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _default(value):
+    if isinstance(value, datetime.datetime | datetime.date | datetime.time | datetime.timedelta):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def respond(payload, list_key="data", format=None):
+    """
+    Encode a list endpoint's payload in the requested format, compressed when
+    the client allows it. Plain JSON for a client that accepts no compression
+    is returned untouched for Frappe to serialise as usual; everything else is
+    returned as a ready Response, wrapped in {"message": ...} like Frappe does.
+    """
+    format = get_response_format(format)
+    if format != JSON_FORMAT and isinstance(payload.get(list_key), list):
+        payload[list_key] = to_columns(payload[list_key])
+        payload["format"] = COLUMNAR_FORMAT
+
+    content_encoding = get_content_encoding()
+    if not getattr(frappe.local, "request", None) or (format == JSON_FORMAT and not content_encoding):
+        return payload
+
+    body = {"message": payload}
+    if format == MSGPACK_FORMAT:
+        try:
+            import msgpack
+        except ImportError:
+            frappe.throw("msgpack responses need the msgpack package installed on the server")
+        content = msgpack.packb(body, default=_default, use_bin_type=True)
+        mimetype = "application/msgpack"
+    else:
+        content = json.dumps(body, default=_default, separators=(",", ":")).encode("utf-8")
+        mimetype = "application/json"
+
+    return _build_response(content, mimetype, content_encoding)
+
+
+def _build_response(content, mimetype, content_encoding):
+    from werkzeug.wrappers import Response
+
+    if content_encoding and len(content) >= MIN_COMPRESS_SIZE:
+        if content_encoding == "br":
+            content = _brotli().compress(content, quality=BROTLI_QUALITY)
+        else:
+            content = gzip.compress(content, compresslevel=GZIP_LEVEL)
+    else:
+        content_encoding = None
+
+    response = Response(content, mimetype=mimetype)
+    if content_encoding:
+        response.headers["Content-Encoding"] = content_encoding
+    # the body depends on both headers, shared caches must key on them
+    response.headers["Vary"] = "Accept, Accept-Encoding"
+    return response
@@ -0,0 +1,196 @@
+import csv
+import gzip
+import hashlib
+import io
+import os
+import tempfile
+from urllib.parse import urlencode
+
+import frappe
+from frappe.utils import get_url, now_datetime, strip_html
+
+from demo.social_media.auth import issue_token, verify_token
+
+EXPORT_HEADER = ["post_id", "title", "description", "content", "category", "image_url", "created_at", "updated_at", "likes"]
+EXPORT_CHUNK_SIZE = 500
+
+# Exports smaller than this stay in memory while spooling, larger ones roll over to disk
+SPOOL_MAX_MEMORY = 1024 * 1024
+STREAM_BUFFER_SIZE = 64 * 1024
+# Seconds an emailed download link stays valid
+EXPORT_LINK_TTL = 24 * 60 * 60
+
+
+def get_export_filename(user_id, compress=False):
+    fname = f"posts_{user_id}_{now_datetime().strftime('%Y%m%d%H%M%S')}.csv"
+    return fname + ".gz" if compress else fname
+
+
+# Yield CSV rows for a user's posts, newest first, fetching EXPORT_CHUNK_SIZE posts at a time
+def iter_post_rows(user_id, chunk_size=EXPORT_CHUNK_SIZE):
+    params = {"user": user_id, "limit": chunk_size}
+    keyset = ""
+    while True:
+        posts = frappe.db.sql(f"""
+            SELECT name, title, description, content, category, image, creation, modified, like_count
+            FROM `tabBlog Post1`
+            WHERE user = %(user)s {keyset}
+            ORDER BY creation DESC, name DESC
+            LIMIT %(limit)s
+        """, params, as_dict=True)
+
+        for p in posts:
+            yield [
+                p.name or "",
+                p.title or "",
+                strip_html(p.description or ""),
+                strip_html(p.content or ""),
+                p.category or "",
+                p.image or "",
+                str(p.creation or ""),
+                str(p.modified or ""),
+                p.like_count or 0
+            ]
+
+        if len(posts) < chunk_size:
+            break
+
+        keyset = """AND (creation < %(cursor_creation)s
+            OR (creation = %(cursor_creation)s AND name < %(cursor_name)s))"""
+        params.update(cursor_creation=posts[-1].creation, cursor_name=posts[-1].name)
+
+
+def write_posts_csv(fileobj, user_id, compress=False):
+    """Write the CSV export (UTF-8 with BOM for Excel) to a binary file object, row by row."""
+    target = gzip.GzipFile(fileobj=fileobj, mode="wb") if compress else fileobj
+    text = io.TextIOWrapper(target, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text, quoting=csv.QUOTE_MINIMAL)
+    writer.writerow(EXPORT_HEADER)
+    for row in iter_post_rows(user_id):
+        writer.writerow(row)
+
+    text.flush()
+    text.detach()
+    if compress:
+        # writes the gzip trailer without closing fileobj
+        target.close()
+
+
+def _file_response(fileobj, fname, content_length, compress=False):
+    from werkzeug.wrappers import Response
+    from werkzeug.wsgi import wrap_file
+
+    response = Response(
+        wrap_file(frappe.local.request.environ, fileobj, buffer_size=STREAM_BUFFER_SIZE),
+        mimetype="application/gzip" if compress else "text/csv",
+        direct_passthrough=True
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="{fname}"'
+    response.headers["Content-Length"] = str(content_length)
+    return response
+
+
+def stream_posts_csv(user_id, compress=False):
+    """
+    Download response for the export. Rows are written to a spooled temporary
+    file as they are fetched, and the body is sent from it in fixed-size blocks.
+    The database is released before the body streams, because Frappe closes
+    the connection as soon as the handler returns.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    write_posts_csv(spool, user_id, compress=compress)
+    content_length = spool.tell()
+    spool.seek(0)
+    return _file_response(spool, get_export_filename(user_id, compress), content_length, compress)
+
+
+def _file_md5(path):
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(STREAM_BUFFER_SIZE), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def get_export_job_id(user_id, compress=True):
+    return f"posts_export:{user_id}:{int(bool(compress))}"
+
+
+def enqueue_posts_export(user_id, recipient=None, compress=True):
+    """Queue build_posts_export, None when the same export is already queued or running."""
+    return frappe.enqueue(
+        "demo.social_media.export.build_posts_export",
+        queue="long",
+        job_id=get_export_job_id(user_id, compress),
+        deduplicate=True,
+        user_id=user_id,
+        recipient=recipient,
+        compress=compress
+    )
+
+
+def get_download_url(file_name, user_id):
+    """Expiring link to download_posts_export, signed for one export File and its owner."""
+    token, _ = issue_token(user_id, ttl=EXPORT_LINK_TTL, scope=f"export:{file_name}")
+    query = urlencode({"file": file_name, "token": token})
+    return get_url(f"/api/method/demo.social_media.api.download_posts_export?{query}")
+
+
+def build_posts_export(user_id, recipient=None, compress=True):
+    """
+    Background job: write the export to the private files folder, register it
+    as a private File attached to the Blog User and email a signed download link.
+    """
+    fname = get_export_filename(user_id, compress)
+    path = frappe.get_site_path("private", "files", fname)
+    with open(path, "wb") as f:
+        write_posts_csv(f, user_id, compress=compress)
+
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        "file_name": fname,
+        "file_url": f"/private/files/{fname}",
+        "file_size": os.path.getsize(path),
+        "content_hash": _file_md5(path),
+        "folder": "Home/Attachments",
+        "attached_to_doctype": "Blog User",
+        "attached_to_name": user_id,
+        "is_private": 1
+    })
+    file_doc.insert(ignore_permissions=True)
+    frappe.db.commit()
+
+    if recipient:
+        try:
+            frappe.sendmail(
+                recipients=recipient,
+                subject="Your Posts Export",
+                message=f"""
+                <p>Your posts export is ready.</p>
+                <p><a href="{get_download_url(file_doc.name, user_id)}">Download {fname}</a></p>
+                <p>The link expires in {EXPORT_LINK_TTL // 3600} hours.</p>
+                """
+            )
+        except Exception as e:
+            frappe.log_error(f"Failed to send posts export email: {e}", "export_posts_csv_guest")
+
+    return file_doc.name
+
+
+def download_export(file_name, token):
+    """Stream a private export File to the holder of a link from get_download_url."""
+    user_id = verify_token(token, scope=f"export:{file_name}")
+    export = user_id and frappe.db.get_value(
+        "File",
+        {"name": file_name, "attached_to_doctype": "Blog User", "attached_to_name": user_id, "is_private": 1},
+        ["file_name", "file_url"],
+        as_dict=True
+    )
+    if not export:
+        frappe.throw("Invalid or expired download link", frappe.PermissionError)
+
+    path = frappe.get_site_path(export.file_url.lstrip("/"))
+    if not os.path.isfile(path):
+        frappe.throw("This export is no longer available", frappe.DoesNotExistError)
+
+    return _file_response(open(path, "rb"), export.file_name, os.path.getsize(path), export.file_name.endswith(".gz"))
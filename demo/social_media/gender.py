@@ -0,0 +1,223 @@
+import time
+from collections import OrderedDict
+
+import frappe
+import requests
+from frappe.utils import add_to_date, now_datetime
+
+GENDERIZE_URL = "https://api.genderize.io/"
+GENDER_MIN_PROBABILITY = 0.6
+GENDER_REQUEST_TIMEOUT = 5
+GENDER_MAX_ATTEMPTS = 3
+# seconds before the first retry, doubled after every failed attempt
+GENDER_RETRY_DELAY = 2
+# genderize accepts at most 10 names per request
+GENDER_BATCH_SIZE = 10
+
+# name -> (gender, probability) answers are kept in Gender Cache rows (shared by all
+# workers, pruned daily by age and count) and in a bounded per-process LRU in front of them
+GENDER_CACHE_TTL = 30 * 24 * 60 * 60
+GENDER_CACHE_MAX_ROWS = 100000
+LOCAL_CACHE_SIZE = 10000
+LOCAL_CACHE_TTL = 6 * 60 * 60
+
+_local_cache = OrderedDict()
+
+
+# The genderize endpoint, overridable with "genderize_api_url" in site_config.json
+def get_api_url():
+    return frappe.conf.get("genderize_api_url") or GENDERIZE_URL
+
+
+def normalize_name(first_name):
+    return (first_name or "").strip().lower()
+
+
+def clear_cache():
+    _local_cache.clear()
+    frappe.db.delete("Gender Cache")
+
+
+def _get_local(name):
+    entry = _local_cache.get(name)
+    if not entry:
+        return None
+    answer, expires_at = entry
+    if expires_at < time.monotonic():
+        del _local_cache[name]
+        return None
+    _local_cache.move_to_end(name)
+    return answer
+
+
+def _set_local(name, answer):
+    _local_cache[name] = (answer, time.monotonic() + LOCAL_CACHE_TTL)
+    _local_cache.move_to_end(name)
+    while len(_local_cache) > LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+
+def _get_stored(names):
+    """Stored answers younger than GENDER_CACHE_TTL, {name: (gender, probability)}."""
+    if not names:
+        return {}
+    rows = frappe.get_all(
+        "Gender Cache",
+        filters={
+            "name": ["in", names],
+            "fetched_on": [">", add_to_date(now_datetime(), seconds=-GENDER_CACHE_TTL)]
+        },
+        fields=["name", "gender", "probability"]
+    )
+    answers = {row.name: (row.gender, row.probability) for row in rows}
+    for name, answer in answers.items():
+        _set_local(name, answer)
+    return answers
+
+
+def get_cached_gender(first_name):
+    """Cached (gender, probability) for a first name, or None without any outbound call."""
+    name = normalize_name(first_name)
+    answer = _get_local(name)
+    if answer is None:
+        answer = _get_stored([name]).get(name)
+    return answer
+
+
+def _store(answers):
+    """Upsert fetched {name: (gender, probability)} answers into Gender Cache."""
+    if not answers:
+        return
+    timestamp = now_datetime()
+    user = frappe.session.user
+    values = []
+    for name, (gender, probability) in answers.items():
+        values.extend((name, gender, probability, timestamp, timestamp, timestamp, user, user))
+        _set_local(name, (gender, probability))
+
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(answers))
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabGender Cache`
+            (name, gender, probability, fetched_on, creation, modified, owner, modified_by)
+        VALUES {placeholders}
+        ON DUPLICATE KEY UPDATE
+            gender = VALUES(gender), probability = VALUES(probability),
+            fetched_on = VALUES(fetched_on), modified = VALUES(modified)
+        """,
+        values
+    )
+
+
+def prune_cache():
+    """Scheduled daily: drop answers older than GENDER_CACHE_TTL, then the oldest beyond GENDER_CACHE_MAX_ROWS."""
+    frappe.db.delete("Gender Cache", {"fetched_on": ["<", add_to_date(now_datetime(), seconds=-GENDER_CACHE_TTL)]})
+    excess = frappe.db.count("Gender Cache") - GENDER_CACHE_MAX_ROWS
+    if excess > 0:
+        frappe.db.sql(
+            "DELETE FROM `tabGender Cache` ORDER BY fetched_on, name LIMIT %(excess)s",
+            {"excess": excess}
+        )
+
+
+def fetch_genders(names):
+    """Ask the genderize API about up to GENDER_BATCH_SIZE names, returns {name: (gender, probability)}."""
+    response = requests.get(
+        get_api_url(),
+        params=[("name[]", name) for name in names],
+        timeout=GENDER_REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    data = response.json()
+    if isinstance(data, dict):
+        data = [data]
+    return {
+        normalize_name(row.get("name")): (row.get("gender"), row.get("probability") or 0)
+        for row in data
+    }
+
+
+def _fetch_with_retries(names):
+    for attempt in range(GENDER_MAX_ATTEMPTS):
+        try:
+            return fetch_genders(names)
+        except (requests.RequestException, ValueError) as e:
+            if attempt == GENDER_MAX_ATTEMPTS - 1:
+                frappe.log_error(f"Gender API Error: {e!s}", "Genderize API")
+                return {}
+            time.sleep(GENDER_RETRY_DELAY * 2 ** attempt)
+
+
+def lookup_genders(first_names):
+    """
+    (gender, probability) for each distinct first name. Cached answers are used
+    first; the rest are fetched from the API in batches and cached.
+    """
+    answers = {}
+    missing = []
+    for name in dict.fromkeys(normalize_name(n) for n in first_names if normalize_name(n)):
+        answer = _get_local(name)
+        if answer is None:
+            missing.append(name)
+        else:
+            answers[name] = answer
+
+    answers.update(_get_stored(missing))
+    missing = [name for name in missing if name not in answers]
+
+    for i in range(0, len(missing), GENDER_BATCH_SIZE):
+        fetched = _fetch_with_retries(missing[i:i + GENDER_BATCH_SIZE])
+        _store(fetched)
+        answers.update(fetched)
+
+    return answers
+
+
+# Map an API answer to the value stored on Blog User
+def to_user_gender(gender, probability):
+    if gender and probability > GENDER_MIN_PROBABILITY:
+        return gender.capitalize()
+    return "Other"
+
+
+def infer_user_gender(user_id, first_name):
+    """Background job: infer a Blog User's gender from their first name and store it."""
+    answer = lookup_genders([first_name]).get(normalize_name(first_name))
+    gender = to_user_gender(*answer) if answer else "Other"
+
+    # the user may have set a gender themselves while the job was waiting
+    if frappe.db.get_value("Blog User", user_id, "gender"):
+        return
+
+    frappe.db.set_value("Blog User", user_id, "gender", gender, update_modified=False)
+    frappe.db.commit()
+
+
+def backfill_genders():
+    """Resolve every Blog User without a gender, one lookup per distinct first name."""
+    users = frappe.get_all("Blog User", filters={"gender": ["is", "not set"]}, fields=["name", "full_name"])
+
+    users_by_name = {}
+    for user in users:
+        first_name = normalize_name((user.full_name or "").split(" ")[0])
+        users_by_name.setdefault(first_name, []).append(user.name)
+
+    answers = lookup_genders(list(users_by_name))
+
+    updated = 0
+    for first_name, user_names in users_by_name.items():
+        answer = answers.get(first_name)
+        if not answer:
+            # API unavailable for this name, leave it for the next run
+            continue
+        gender = to_user_gender(*answer)
+        for i in range(0, len(user_names), 1000):
+            chunk = user_names[i:i + 1000]
+            frappe.db.sql(
+                "UPDATE `tabBlog User` SET gender = %(gender)s WHERE name IN %(names)s",
+                {"gender": gender, "names": tuple(chunk)}
+            )
+            updated += len(chunk)
+
+    frappe.db.commit()
+    return updated
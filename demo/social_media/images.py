@@ -0,0 +1,159 @@
+import hashlib
+import os
+
+import frappe
+from PIL import Image, ImageOps, features
+
+# Derivative sizes a client may ask for: name -> (Blog Post1 field, width in px)
+IMAGE_SIZES = {
+    "thumbnail": ("image_thumbnail", 160),
+    "feed": ("image_feed", 640),
+    "full": ("image_full", 1280),
+}
+ORIGINAL_SIZE = "original"
+
+# Written under public/files, named after the source URL so re-runs overwrite them
+# and posts sharing a stored image share its derivatives
+DERIVATIVES_FOLDER = "derivatives"
+DERIVATIVE_EXTENSIONS = ("webp", "jpg")
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+ENQUEUE_CHUNK_SIZE = 100
+
+
+def get_image_field(image_size):
+    """Blog Post1 field holding the requested derivative, None for the original upload."""
+    if not image_size or image_size == ORIGINAL_SIZE:
+        return None
+    if image_size not in IMAGE_SIZES:
+        frappe.throw(f"Invalid image_size, use one of: {', '.join([*IMAGE_SIZES, ORIGINAL_SIZE])}")
+    return IMAGE_SIZES[image_size][0]
+
+
+def resolve_images(rows, image_field, image_key="image"):
+    """
+    Point each row's image at the derivative in `image_field` (popped from the
+    row), keeping the original until the derivative has been generated.
+    """
+    if not image_field:
+        return rows
+    for row in rows:
+        derivative = row.pop(image_field, None)
+        if derivative and row.get(image_key):
+            row[image_key] = derivative
+    return rows
+
+
+def get_source_path(file_url):
+    """Disk path of a public file URL, None for private, remote or unsafe URLs."""
+    if not file_url or not file_url.startswith("/files/"):
+        return None
+    files_path = os.path.realpath(frappe.get_site_path("public", "files"))
+    path = os.path.realpath(os.path.join(files_path, file_url[len("/files/"):]))
+    if not path.startswith(files_path + os.sep):
+        return None
+    return path if os.path.isfile(path) else None
+
+
+def get_derivative_name(file_url, size, extension):
+    """
+    File name of one derivative. The hash of the whole URL keeps sources that
+    share a stem ("a.jpg" and "a.png", or one name in two folders) apart.
+    """
+    stem = os.path.splitext(os.path.basename(file_url))[0]
+    digest = hashlib.md5(file_url.encode("utf-8")).hexdigest()[:10]
+    return f"{stem}-{digest}-{size}.{extension}"
+
+
+def build_derivatives(file_url):
+    """Write the fixed-width derivatives of a public image, returns {Blog Post1 field: URL}."""
+    source = get_source_path(file_url)
+    if not source:
+        return {}
+
+    use_webp = features.check("webp")
+    extension = "webp" if use_webp else "jpg"
+    folder = frappe.get_site_path("public", "files", DERIVATIVES_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+
+    urls = {
+        fieldname: f"/files/{DERIVATIVES_FOLDER}/{get_derivative_name(file_url, size, extension)}"
+        for size, (fieldname, _) in IMAGE_SIZES.items()
+    }
+    if all(os.path.exists(os.path.join(folder, os.path.basename(url))) for url in urls.values()):
+        return urls
+
+    with Image.open(source) as original:
+        # JPEGs decode straight at a reduced scale when the largest derivative allows it
+        largest = max(width for _, width in IMAGE_SIZES.values())
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        if not use_webp and image.mode == "RGBA":
+            image = image.convert("RGB")
+
+        for fieldname, width in IMAGE_SIZES.values():
+            resized = image
+            if image.width > width:
+                resized = image.resize((width, max(1, image.height * width // image.width)), Image.LANCZOS)
+
+            path = os.path.join(folder, os.path.basename(urls[fieldname]))
+            if use_webp:
+                resized.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+            else:
+                resized.save(path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+    return urls
+
+
+def remove_derivatives(file_url):
+    """Delete the derivative files built from a public image."""
+    folder = frappe.get_site_path("public", "files", DERIVATIVES_FOLDER)
+    for size in IMAGE_SIZES:
+        for extension in DERIVATIVE_EXTENSIONS:
+            path = os.path.join(folder, get_derivative_name(file_url, size, extension))
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def generate_post_images(posts):
+    """Background job: build the image derivatives of Blog Post1 records."""
+    images = frappe.get_all(
+        "Blog Post1", filters={"name": ["in", list(posts)], "image": ["is", "set"]}, fields=["name", "image"]
+    )
+    for post in images:
+        try:
+            urls = build_derivatives(post.image)
+        except Exception:
+            frappe.log_error(f"Could not build image derivatives for {post.name}", "Post Image Derivatives")
+            continue
+
+        # Skip posts whose image changed while this job was waiting
+        if urls:
+            frappe.db.set_value("Blog Post1", {"name": post.name, "image": post.image}, urls, update_modified=False)
+
+
+def enqueue_post_images(posts):
+    posts = list(posts)
+    for i in range(0, len(posts), ENQUEUE_CHUNK_SIZE):
+        frappe.enqueue(
+            "demo.social_media.images.generate_post_images",
+            queue="short",
+            posts=posts[i:i + ENQUEUE_CHUNK_SIZE],
+            enqueue_after_commit=True
+        )
+
+
+# doc_events: on_update
+def on_post_change(doc, method=None):
+    before = doc.get_doc_before_save()
+    if before and before.image == doc.image:
+        return
+
+    # Derivatives of the previous image would show until the job has run
+    stale = {fieldname: None for fieldname, _ in IMAGE_SIZES.values() if doc.get(fieldname)}
+    if stale:
+        doc.db_set(stale, update_modified=False)
+    if doc.image:
+        enqueue_post_images([doc.name])
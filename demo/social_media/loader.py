@@ -0,0 +1,48 @@
+import frappe
+
+# Documents loaded during the current request, keyed by (doctype, name), None marks a missing record.
+# frappe.local is released at the end of every request, which drops the cache with it.
+LOCAL_CACHE_KEY = "social_media_loaded_docs"
+
+
+def _loaded():
+    cache = getattr(frappe.local, LOCAL_CACHE_KEY, None)
+    if cache is None:
+        cache = {}
+        setattr(frappe.local, LOCAL_CACHE_KEY, cache)
+    return cache
+
+
+def get_doc(doctype, name):
+    """
+    Load a document at most once per request, returns None when it does not
+    exist, so callers need no frappe.db.exists check before loading it.
+    """
+    if not name or str(name).strip() == "":
+        return None
+
+    cache = _loaded()
+    key = (doctype, name)
+    if key not in cache:
+        try:
+            cache[key] = frappe.get_doc(doctype, name)
+        except frappe.DoesNotExistError:
+            # get_doc queues a "not found" message, the caller reports this its own way
+            frappe.clear_last_message()
+            cache[key] = None
+    return cache[key]
+
+
+def require(validation_errors, field, doctype, name, message=None):
+    """get_doc that records `message` for `field` in validation_errors when the record is missing."""
+    doc = get_doc(doctype, name)
+    if not doc and field not in validation_errors:
+        validation_errors[field] = message or f"{doctype} does not exist"
+    return doc
+
+
+def forget(doctype, names):
+    """Drop deleted records from the request cache."""
+    cache = _loaded()
+    for name in [names] if isinstance(names, str) else names:
+        cache.pop((doctype, name), None)
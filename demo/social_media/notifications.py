@@ -0,0 +1,20 @@
+import frappe
+
+
+def send_welcome_email(user_id):
+    """Background job: queue the welcome email for a newly created Blog User."""
+    user = frappe.db.get_value("Blog User", user_id, ["full_name", "email"], as_dict=True)
+    if not user:
+        return
+
+    frappe.sendmail(
+        recipients=user.email,
+        subject="Welcome to Social Media 🎉",
+        message=f"""
+        <h3>Hello {user.full_name},</h3>
+        <p>Your account has been successfully created!</p>
+        <p><b>Email:</b> {user.email}</p>
+        <p>Login and start posting 🚀</p>
+        """
+    )
+    frappe.db.commit()
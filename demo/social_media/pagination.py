@@ -0,0 +1,108 @@
+import base64
+import json
+
+import frappe
+
+
+# Encode keyset values into an opaque, URL-safe cursor string
+def encode_cursor(*values):
+    payload = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+# Decode a cursor produced by encode_cursor back into its list of values
+def decode_cursor(cursor, expected_length=None):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        frappe.throw("Invalid cursor")
+
+    if not isinstance(values, list) or (expected_length and len(values) != expected_length):
+        frappe.throw("Invalid cursor")
+
+    return values
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+# Parse a client supplied page size, clamped to the server side maximum
+def get_limit(limit, default=DEFAULT_PAGE_SIZE):
+    if limit in (None, ""):
+        return default
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        frappe.throw("Invalid limit")
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+# Parse requested fields (JSON list or comma separated) against a whitelist
+def get_fields(fields, allowed, default):
+    if not fields:
+        return list(default)
+    if isinstance(fields, str):
+        fields = frappe.parse_json(fields) if fields.strip().startswith("[") else fields.split(",")
+
+    fields = list(dict.fromkeys(str(f).strip() for f in fields if f and str(f).strip()))
+    invalid = [f for f in fields if f not in allowed]
+    if invalid:
+        frappe.throw(f"Fields not allowed: {', '.join(invalid)}")
+    return fields
+
+
+def get_page(doctype, fields, filters=None, limit=None, cursor=None):
+    """
+    One page of `doctype`, newest first, keyset-paged on (creation, name).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    from frappe.query_builder import Order
+
+    limit = get_limit(limit)
+    table = frappe.qb.DocType(doctype)
+    columns = list(dict.fromkeys([*fields, "name", "creation"]))
+
+    query = frappe.qb.from_(table).select(*(table[f] for f in columns))
+    for fieldname, value in (filters or {}).items():
+        query = query.where(table[fieldname] == value)
+
+    if cursor:
+        creation, name = decode_cursor(cursor, 2)
+        query = query.where(
+            (table.creation < creation) | ((table.creation == creation) & (table.name < name))
+        )
+
+    rows = (
+        query.orderby(table.creation, order=Order.desc)
+        .orderby(table.name, order=Order.desc)
+        .limit(limit + 1)
+        .run(as_dict=True)
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].creation, rows[-1].name)
+
+    extra = [f for f in ("name", "creation") if f not in fields]
+    for row in rows:
+        for fieldname in extra:
+            row.pop(fieldname, None)
+
+    return rows, next_cursor
+
+
+def get_rows_by_name(doctype, names, fields):
+    """Rows of `doctype` for `names` in one query, in the order of `names`, skipping missing records."""
+    if not names:
+        return []
+
+    columns = list(dict.fromkeys([*fields, "name"]))
+    rows = {row.name: row for row in frappe.get_all(doctype, filters={"name": ["in", list(names)]}, fields=columns)}
+    ordered = [rows[name] for name in names if name in rows]
+    if "name" not in fields:
+        for row in ordered:
+            row.pop("name")
+    return ordered
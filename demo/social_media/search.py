@@ -0,0 +1,146 @@
+import html
+import re
+from collections import Counter
+
+import frappe
+from frappe.utils import now_datetime, strip_html
+
+# Indexed fields per doctype, with the weight each token occurrence adds to relevance
+INDEXED_FIELDS = {
+    "Blog Post1": {"title": 5, "description": 2, "content": 1},
+    "Blog Post2": {"title": 5, "content": 1},
+}
+
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+MAX_QUERY_TERMS = 8
+REBUILD_CHUNK_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+STOP_WORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with"
+))
+
+
+# Split text (HTML allowed) into lowercase index tokens
+def tokenize(text):
+    text = html.unescape(strip_html(text or "")).lower()
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        if len(token) < MIN_TOKEN_LENGTH or token in STOP_WORDS:
+            continue
+        tokens.append(token[:MAX_TOKEN_LENGTH])
+    return tokens
+
+
+# Weighted term frequencies for one record (dict or document)
+def get_term_weights(doctype, record):
+    weights = Counter()
+    for fieldname, weight in INDEXED_FIELDS[doctype].items():
+        for token in tokenize(record.get(fieldname)):
+            weights[token] += weight
+    return weights
+
+
+def _insert_terms(doctype, terms_by_name):
+    timestamp = now_datetime()
+    values = [
+        (frappe.generate_hash(length=12), term, doctype, name, weight, timestamp, timestamp)
+        for name, weights in terms_by_name.items()
+        for term, weight in weights.items()
+    ]
+    if values:
+        frappe.db.bulk_insert(
+            "Blog Search Term",
+            ["name", "term", "reference_doctype", "reference_name", "weight", "creation", "modified"],
+            values
+        )
+
+
+# doc_events: on_update
+def index_document(doc, method=None):
+    before = doc.get_doc_before_save()
+    if before and all(before.get(f) == doc.get(f) for f in INDEXED_FIELDS[doc.doctype]):
+        return
+
+    remove_documents(doc.doctype, [doc.name])
+    _insert_terms(doc.doctype, {doc.name: get_term_weights(doc.doctype, doc)})
+
+
+# doc_events: on_trash
+def remove_document(doc, method=None):
+    remove_documents(doc.doctype, [doc.name])
+
+
+def remove_documents(doctype, names):
+    if not names:
+        return
+    frappe.db.sql(
+        """
+        DELETE FROM `tabBlog Search Term`
+        WHERE reference_doctype = %(doctype)s AND reference_name IN %(names)s
+        """,
+        {"doctype": doctype, "names": tuple(names)}
+    )
+
+
+def index_documents(doctype, names):
+    """Index freshly inserted records in one pass (used by bulk writes)."""
+    if not names:
+        return
+    fields = ["name", *INDEXED_FIELDS[doctype]]
+    records = frappe.get_all(doctype, filters={"name": ["in", list(names)]}, fields=fields)
+    remove_documents(doctype, names)
+    _insert_terms(doctype, {r.name: get_term_weights(doctype, r) for r in records})
+
+
+def rebuild_index(doctype=None):
+    """Drop and rebuild the search index for one or all indexed doctypes."""
+    for dt in [doctype] if doctype else list(INDEXED_FIELDS):
+        frappe.db.delete("Blog Search Term", {"reference_doctype": dt})
+        fields = ["name", *INDEXED_FIELDS[dt]]
+        last_name = None
+        while True:
+            filters = {"name": [">", last_name]} if last_name else {}
+            records = frappe.get_all(
+                dt, filters=filters, fields=fields, order_by="name asc", limit_page_length=REBUILD_CHUNK_SIZE
+            )
+            if not records:
+                break
+            _insert_terms(dt, {r.name: get_term_weights(dt, r) for r in records})
+            last_name = records[-1].name
+
+
+def build_match_query(doctype, search, alias="sr"):
+    """
+    Build a derived table of (reference_name, relevance) for records matching
+    every term of `search`, each term matched as a prefix of an indexed token.
+    Returns (None, {}) when the search has no indexable terms, callers must
+    then match nothing rather than drop the filter.
+    """
+    terms = list(dict.fromkeys(tokenize(search)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None, {}
+
+    params = {f"{alias}_doctype": doctype}
+    subqueries = []
+    for i, term in enumerate(terms):
+        params[f"{alias}_term_{i}"] = term
+        params[f"{alias}_prefix_{i}"] = term.replace("\\", "\\\\").replace("_", "\\_") + "%"
+        subqueries.append(f"""
+            SELECT reference_name,
+                SUM(CASE WHEN term = %({alias}_term_{i})s THEN weight * 2 ELSE weight END) AS relevance
+            FROM `tabBlog Search Term`
+            WHERE reference_doctype = %({alias}_doctype)s AND term LIKE %({alias}_prefix_{i})s
+            GROUP BY reference_name
+        """)
+
+    query = f"SELECT t0.reference_name, {' + '.join(f't{i}.relevance' for i in range(len(terms)))} AS relevance"
+    query += f" FROM ({subqueries[0]}) t0"
+    for i, subquery in enumerate(subqueries[1:], start=1):
+        query += f" INNER JOIN ({subquery}) t{i} ON t{i}.reference_name = t0.reference_name"
+
+    return query, params
+
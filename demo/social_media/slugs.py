@@ -0,0 +1,64 @@
+import re
+
+import frappe
+
+# Redis hash: base slug -> last numeric suffix handed out for it
+SLUG_SUFFIX_KEY = "social_media:blog_slug_suffix"
+MAX_ROUTE_ATTEMPTS = 5
+
+
+def make_slug(title):
+    return frappe.scrub(title or "").replace("_", "-")
+
+
+def is_route_for(route, base):
+    """True if `route` is `base` itself or `base` with a numeric suffix."""
+    return bool(route) and (route == base or re.fullmatch(rf"{re.escape(base)}-\d+", route) is not None)
+
+
+def route_is_taken(route, name):
+    # point lookup on the unique route index
+    return bool(frappe.db.exists("Blog Post2", {"route": route, "name": ["!=", name]}))
+
+
+def _highest_suffix(base):
+    routes = frappe.get_all("Blog Post2", filters={"route": ["like", f"{base}-%"]}, pluck="route")
+    suffixes = [int(r.rsplit("-", 1)[1]) for r in routes if is_route_for(r, base) and r != base]
+    return max(suffixes, default=1)
+
+
+def next_suffix(base):
+    """
+    Next numeric suffix for `base` from an atomic Redis counter. A fresh counter
+    (e.g. after a cache flush) is seeded once from the routes already stored.
+    """
+    cache = frappe.cache()
+    key = cache.make_key(SLUG_SUFFIX_KEY)
+    suffix = cache.hincrby(key, base, 1)
+    if suffix == 1:
+        suffix = cache.hincrby(key, base, _highest_suffix(base))
+    return suffix
+
+
+def allocate_route(doc):
+    """Pick a free route for a Blog Post2: its slug, or the slug with the next free suffix."""
+    base = make_slug(doc.title)
+    before = None if doc.is_new() else doc.get_doc_before_save()
+
+    # an unchanged route that still matches the title needs no lookup at all
+    if before and before.route == doc.route and is_route_for(doc.route, base):
+        return doc.route
+
+    candidate = base
+    for _ in range(MAX_ROUTE_ATTEMPTS):
+        if not route_is_taken(candidate, doc.name):
+            return candidate
+        candidate = f"{base}-{next_suffix(base)}"
+
+    frappe.throw("Could not allocate a unique route for this blog post, please try again.")
+
+
+def is_route_conflict(error):
+    """True if a unique violation raised while writing Blog Post2 was caused by the route index."""
+    message = str(error)
+    return bool(re.search(r"for key '(?:[^']*\.)?route'|_route_key\b", message))
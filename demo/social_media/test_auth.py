@@ -0,0 +1,67 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from demo.social_media.auth import authenticated, issue_token, verify_token
+
+
+@authenticated()
+def whoami(user_id=None):
+	return user_id
+
+
+class TestAuth(FrappeTestCase):
+	def test_token_round_trip(self):
+		token, expires_at = issue_token("BU-0001")
+		self.assertEqual(verify_token(token), "BU-0001")
+		self.assertGreater(expires_at, time.time())
+
+	def test_tampered_token_is_rejected(self):
+		token, _ = issue_token("BU-0001")
+		other, _ = issue_token("BU-0002")
+		self.assertIsNone(verify_token(f"{other.split('.')[0]}.{token.split('.')[1]}"))
+		self.assertIsNone(verify_token(token + "x"))
+		self.assertIsNone(verify_token("not-a-token"))
+		self.assertIsNone(verify_token(None))
+
+	def test_expired_token_is_rejected(self):
+		token, expires_at = issue_token("BU-0001")
+		with patch("demo.social_media.auth.time.time", return_value=expires_at + 1):
+			self.assertIsNone(verify_token(token))
+
+	def test_scoped_token_only_verifies_for_its_scope(self):
+		token, _ = issue_token("BU-0001", ttl=60, scope="export:abc")
+		self.assertEqual(verify_token(token, scope="export:abc"), "BU-0001")
+		self.assertIsNone(verify_token(token, scope="export:other"))
+		self.assertIsNone(verify_token(token))
+
+		login, _ = issue_token("BU-0001")
+		self.assertIsNone(verify_token(login, scope="export:abc"))
+
+	def test_decorator_injects_token_user(self):
+		token, _ = issue_token("BU-0001")
+		self.assertEqual(whoami(token=token), "BU-0001")
+		self.assertEqual(whoami(token=token, user_id="BU-0001", cmd="ignored"), "BU-0001")
+		self.assertEqual(whoami(token=token, user_id="BU-0002")["status_code"], 403)
+		self.assertEqual(whoami(user_id="BU-0001")["status_code"], 401)
+
+	def test_token_reaches_decorator_through_frappe_call(self):
+		# the handler calls frappe.call(method, **form_dict), which drops arguments whoami does not declare
+		token, _ = issue_token("BU-0001")
+		form_dict = getattr(frappe.local, "form_dict", None)
+		try:
+			frappe.local.form_dict = frappe._dict(cmd="whoami", token=token)
+			self.assertEqual(frappe.call(whoami, **frappe.form_dict), "BU-0001")
+
+			frappe.local.form_dict = frappe._dict(cmd="whoami", token=token, user_id="BU-0002")
+			self.assertEqual(frappe.call(whoami, **frappe.form_dict)["status_code"], 403)
+
+			frappe.local.form_dict = frappe._dict(cmd="whoami", user_id="BU-0001")
+			self.assertEqual(frappe.call(whoami, **frappe.form_dict)["status_code"], 401)
+		finally:
+			frappe.local.form_dict = form_dict
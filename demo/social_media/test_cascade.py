@@ -0,0 +1,122 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from demo.social_media import bulk, cascade, timelines, trending
+from demo.social_media.doctype.blog_post1.blog_post1 import repair_like_counts
+from demo.social_media.timelines import MemoryTimelineStore, get_timeline_key
+from demo.social_media.user_summary import get_user_summaries
+
+
+class TestCascade(FrappeTestCase):
+	"""delete_user and delete_posts, with timelines in memory and trending lists under a test-only prefix."""
+
+	def setUp(self):
+		suffix = frappe.generate_hash(length=8)
+		self.store = MemoryTimelineStore()
+		timelines.set_store(self.store)
+		self.prefix = f"social_media:test_cascade:{suffix}:"
+		self.patches = [
+			patch.object(trending, "SCORES_KEY", f"{self.prefix}scores"),
+			patch.object(trending, "TOP_KEY_PREFIX", f"{self.prefix}top:"),
+		]
+		for p in self.patches:
+			p.start()
+
+		self.category = f"Cascade {suffix}"
+		self.author, self.fan, self.other = (self.make_user(name) for name in ("Author", "Fan", "Other"))
+		self.posts = self.make_posts(self.author, 3)
+		self.kept = self.make_posts(self.fan, 2)
+		bulk.insert_rows(
+			"Blog Like1",
+			"LIKE",
+			[
+				bulk.like_row({"post": post, "user": user.name})
+				for post, user in (
+					(self.posts[0], self.fan),
+					(self.posts[1], self.fan),
+					(self.posts[0], self.other),
+					(self.kept[0], self.author),
+					(self.kept[1], self.author),
+					(self.kept[0], self.other),
+				)
+			],
+		)
+		repair_like_counts([*self.posts, *self.kept])
+
+	def tearDown(self):
+		timelines.set_store(None)
+		redis = frappe.cache()
+		pipe = redis.pipeline()
+		for key in redis.scan_iter(match=redis.make_key(f"{self.prefix}*")):
+			pipe.delete(key)
+		pipe.execute()
+		for p in self.patches:
+			p.stop()
+
+	def make_user(self, full_name):
+		return frappe.get_doc(
+			{
+				"doctype": "Blog User",
+				"full_name": f"Cascade {full_name}",
+				"email": f"cascade-{frappe.generate_hash(length=8)}@example.com",
+				"password": "Password123",
+				"gender": "Other",
+			}
+		).insert()
+
+	def make_posts(self, user, count):
+		return bulk.insert_rows(
+			"Blog Post1",
+			"POST",
+			[
+				bulk.post_row({"title": f"{user.full_name} post {i}", "category": self.category, "user": user.name})
+				for i in range(count)
+			],
+		)
+
+	def get_category_timeline(self):
+		return {name for name, _ in timelines.get_timeline_page("category", self.category, 10)}
+
+	def get_likes(self, user):
+		summary = get_user_summaries([user.name])[user.name]
+		return {post["title"]: post["likes"] for post in summary["posts"]}
+
+	def test_delete_user(self):
+		# built and cached before the delete, so they have to be corrected
+		self.assertEqual(self.get_category_timeline(), {*self.posts, *self.kept})
+		timelines.get_timeline_page("user", self.author.name, 10)
+		self.assertEqual(self.get_likes(self.fan), {"Cascade Fan post 0": 2, "Cascade Fan post 1": 1})
+
+		deleted = cascade.delete_user(self.author.name)
+		frappe.db.after_commit.run()
+
+		self.assertEqual(deleted, {"posts": 3, "likes": 5, "files": 0, "users": 1})
+		self.assertFalse(frappe.db.exists("Blog User", self.author.name))
+		self.assertFalse(frappe.db.exists("Blog Post1", {"user": self.author.name}))
+		self.assertFalse(frappe.db.exists("Blog Like1", {"post": ["in", self.posts]}))
+		self.assertFalse(frappe.db.exists("Blog Like1", {"user": self.author.name}))
+
+		self.assertEqual([frappe.db.get_value("Blog Post1", post, "like_count") for post in self.kept], [1, 0])
+		self.assertEqual(self.get_likes(self.fan), {"Cascade Fan post 0": 1, "Cascade Fan post 1": 0})
+		self.assertEqual(self.get_category_timeline(), set(self.kept))
+		self.assertFalse(self.store.exists(get_timeline_key("user", self.author.name)))
+
+	def test_delete_posts(self):
+		self.assertEqual(len(self.get_likes(self.author)), 3)
+		self.get_category_timeline()
+
+		deleted = cascade.delete_posts(self.posts[:2])
+		frappe.db.after_commit.run()
+
+		self.assertEqual(deleted, {"posts": 2, "likes": 3, "files": 0})
+		self.assertEqual(frappe.get_all("Blog Post1", filters={"user": self.author.name}, pluck="name"), self.posts[2:])
+		self.assertEqual(frappe.db.count("Blog Like1", {"user": self.fan.name}), 0)
+		self.assertEqual(self.get_likes(self.author), {"Cascade Author post 2": 0})
+		self.assertEqual(self.get_category_timeline(), {self.posts[2], *self.kept})
+		# likes on other posts are left alone
+		self.assertEqual([frappe.db.get_value("Blog Post1", post, "like_count") for post in self.kept], [2, 1])
@@ -0,0 +1,30 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from demo.social_media.encoding import COLUMNAR_FORMAT, get_response_format, respond, to_columns
+
+
+class TestEncoding(FrappeTestCase):
+	def test_to_columns(self):
+		rows = [{"name": "a", "title": "A"}, {"name": "b", "likes": 3}]
+		self.assertEqual(to_columns(rows), {
+			"name": ["a", "b"],
+			"title": ["A", None],
+			"likes": [None, 3],
+		})
+		self.assertEqual(to_columns([]), {})
+
+	def test_columnar_payload(self):
+		payload = respond({"status": "success", "data": [{"name": "a"}, {"name": "b"}]}, format="columnar")
+		self.assertEqual(payload["format"], COLUMNAR_FORMAT)
+		self.assertEqual(payload["data"], {"name": ["a", "b"]})
+
+	def test_json_payload_is_untouched(self):
+		payload = {"status": "success", "data": [{"name": "a"}]}
+		self.assertIs(respond(payload, format="json"), payload)
+
+	def test_invalid_format(self):
+		self.assertRaises(frappe.ValidationError, get_response_format, "xml")
@@ -0,0 +1,67 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import os
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from PIL import Image
+
+from demo.social_media.images import (
+	IMAGE_SIZES,
+	build_derivatives,
+	get_source_path,
+	remove_derivatives,
+	resolve_images,
+)
+
+
+class TestImages(FrappeTestCase):
+	def setUp(self):
+		self.file_name = f"test-derivatives-{frappe.generate_hash(length=6)}.png"
+		self.path = frappe.get_site_path("public", "files", self.file_name)
+		Image.new("RGB", (2000, 1000), "orange").save(self.path)
+		self.urls = {}
+
+	def tearDown(self):
+		for url in [f"/files/{self.file_name}", *self.urls.values()]:
+			path = get_source_path(url)
+			if path:
+				os.remove(path)
+
+	def test_build_derivatives(self):
+		self.urls = build_derivatives(f"/files/{self.file_name}")
+		self.assertEqual(set(self.urls), {fieldname for fieldname, _ in IMAGE_SIZES.values()})
+		for fieldname, width in IMAGE_SIZES.values():
+			with Image.open(get_source_path(self.urls[fieldname])) as image:
+				self.assertEqual(image.size, (width, width // 2))
+
+	def test_sources_sharing_a_stem_keep_their_derivatives(self):
+		jpeg_name = self.file_name.replace(".png", ".jpg")
+		Image.new("RGB", (2000, 1000), "blue").save(frappe.get_site_path("public", "files", jpeg_name))
+		jpeg_urls = {}
+		try:
+			self.urls = build_derivatives(f"/files/{self.file_name}")
+			jpeg_urls = build_derivatives(f"/files/{jpeg_name}")
+			self.assertFalse(set(self.urls.values()) & set(jpeg_urls.values()))
+
+			remove_derivatives(f"/files/{jpeg_name}")
+			self.assertFalse(any(get_source_path(url) for url in jpeg_urls.values()))
+			self.assertTrue(all(get_source_path(url) for url in self.urls.values()))
+		finally:
+			for url in [f"/files/{jpeg_name}", *jpeg_urls.values()]:
+				if get_source_path(url):
+					os.remove(get_source_path(url))
+
+	def test_unsafe_urls_are_ignored(self):
+		self.assertIsNone(get_source_path("/files/../../site_config.json"))
+		self.assertIsNone(get_source_path("https://example.com/photo.jpg"))
+		self.assertEqual(build_derivatives("/private/files/photo.jpg"), {})
+
+	def test_resolve_images_falls_back_to_original(self):
+		rows = [
+			{"image": "/files/a.png", "image_feed": "/files/derivatives/a-feed.webp"},
+			{"image": "/files/b.png", "image_feed": None},
+		]
+		resolve_images(rows, "image_feed")
+		self.assertEqual(rows, [{"image": "/files/derivatives/a-feed.webp"}, {"image": "/files/b.png"}])
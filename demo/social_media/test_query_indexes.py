@@ -0,0 +1,196 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import unittest
+from contextlib import contextmanager
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from demo.social_media import bulk
+from demo.social_media.api import get_posts_advanced, get_user_liked_posts, login_user
+from demo.social_media.auth import issue_token
+from demo.social_media.blog_cache import (
+	clear_blog_list_cache,
+	clear_blog_route_cache,
+	get_blog_by_route,
+	get_blog_list_page,
+)
+from demo.social_media.doctype.blog_like1.blog_like1 import get_like
+from demo.social_media.doctype.blog_post1.blog_post1 import repair_like_counts
+from demo.social_media.pagination import get_page
+from demo.social_media.timelines import _query_posts
+
+USER_COUNT = 4
+POSTS_PER_USER = 50
+LIKES_PER_USER = 40
+BLOG_COUNT = 40
+
+
+@contextmanager
+def capture_queries():
+	"""Record every (query, values) sent to frappe.db.sql while still running it."""
+	queries = []
+	sql = frappe.db.sql
+
+	def recording_sql(query, values=(), *args, **kwargs):
+		queries.append((str(query), values))
+		return sql(query, values, *args, **kwargs)
+
+	frappe.db.sql = recording_sql
+	try:
+		yield queries
+	finally:
+		del frappe.db.sql
+
+
+def get_chosen_keys(query, values=None):
+	"""EXPLAIN a query, returns {table alias: key the optimizer chose}."""
+	return {row.get("table"): row.get("key") for row in frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True)}
+
+
+class TestQueryIndexes(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		if frappe.db.db_type != "mariadb":
+			raise unittest.SkipTest("EXPLAIN output is MariaDB specific")
+
+		suffix = frappe.generate_hash(length=6)
+		cls.categories = [f"Index Test {i}" for i in range(2)]
+		for category in cls.categories:
+			if not frappe.db.exists("Blog Category1", category):
+				frappe.get_doc({"doctype": "Blog Category1", "category_name": category}).insert()
+
+		# Enough rows across several users and categories that a full scan never looks cheaper
+		cls.users = [
+			frappe.get_doc(
+				{
+					"doctype": "Blog User",
+					"full_name": f"Index Tester {i}",
+					"email": f"index-{i}-{suffix}@example.com",
+					"password": "Password123",
+					"gender": "Other",
+				}
+			).insert()
+			for i in range(USER_COUNT)
+		]
+		cls.user = cls.users[0]
+		cls.posts = bulk.insert_rows(
+			"Blog Post1",
+			"POST",
+			[
+				bulk.post_row(
+					{
+						"title": f"Index post {u}-{i} {suffix}",
+						"description": "description",
+						"content": "<p>content</p>",
+						"category": cls.categories[i % 2],
+						"user": user.name,
+					}
+				)
+				for u, user in enumerate(cls.users)
+				for i in range(POSTS_PER_USER)
+			],
+		)
+		cls.likes = bulk.insert_rows(
+			"Blog Like1",
+			"LIKE",
+			[
+				bulk.like_row({"post": post, "user": user.name})
+				for u, user in enumerate(cls.users)
+				for post in cls.posts[(u + 1) * POSTS_PER_USER % len(cls.posts) :][:LIKES_PER_USER]
+			],
+		)
+
+		author = frappe.get_doc({"doctype": "Blog User2", "username": f"index-author-{suffix}"}).insert()
+		cls.blogs = [
+			frappe.get_doc(
+				{
+					"doctype": "Blog Post2",
+					"title": f"Index blog {i} {suffix}",
+					"content": "<p>content</p>",
+					"author": author.name,
+					"status": "Published" if i % 2 else "Draft",
+					"published_on": add_days(nowdate(), -i),
+				}
+			).insert()
+			for i in range(BLOG_COUNT)
+		]
+		cls.blog = cls.blogs[1]
+
+	def setUp(self):
+		clear_blog_list_cache()
+		clear_blog_route_cache([self.blog.route])
+
+	def assertIndexUsed(self, queries, table, index, pattern=""):
+		"""The optimizer picks `index` for `table` in the captured queries that mention `pattern`."""
+		explained = [
+			get_chosen_keys(query, values)
+			for query, values in queries
+			if query.lstrip().upper().startswith("SELECT") and pattern in query
+		]
+		explained = [keys for keys in explained if table in keys]
+		self.assertTrue(explained, f"no query on {table} was run")
+		for keys in explained:
+			self.assertEqual(keys[table], index, f"{table} is read with {keys[table]} instead of {index}")
+
+	def test_login_user_email_lookup(self):
+		with capture_queries() as queries:
+			login_user(email=self.user.email, password="wrong")
+		self.assertIndexUsed(queries, "tabBlog User", "email", "email")
+
+	def test_user_liked_posts(self):
+		with capture_queries() as queries:
+			get_user_liked_posts(user_id=self.user.name, token=issue_token(self.user.name)[0])
+		self.assertIndexUsed(queries, "bl", "user_creation_index", "tabBlog Like1")
+
+	def test_like_lookup_by_post_and_user(self):
+		with capture_queries() as queries:
+			get_like(self.posts[POSTS_PER_USER], self.user.name)
+		self.assertIndexUsed(queries, "tabBlog Like1", "unique_post_user")
+
+	def test_likes_by_post(self):
+		# the recount counts each post's likes in a correlated subquery
+		with capture_queries() as queries:
+			repair_like_counts([self.posts[POSTS_PER_USER]])
+		self.assertEqual(get_chosen_keys(*queries[-1])["bl"], "unique_post_user")
+
+	def test_posts_advanced_by_user(self):
+		with capture_queries() as queries:
+			get_posts_advanced(user=self.user.name, page_size=10)
+		self.assertIndexUsed(queries, "bp", "user_creation_index", "ORDER BY")
+
+		with capture_queries() as queries:
+			response = get_posts_advanced(user=self.user.name, page_size=10)
+			get_posts_advanced(user=self.user.name, page_size=10, cursor=response["next_cursor"])
+		self.assertIndexUsed(queries, "bp", "user_creation_index", "cursor_value")
+
+	def test_posts_advanced_cursor_sorts(self):
+		for sort_by, index in (("title", "title_name_index"), ("total_likes", "like_count_name_index")):
+			with capture_queries() as queries:
+				response = get_posts_advanced(sort_by=sort_by, sort_order="asc", page_size=10)
+				get_posts_advanced(sort_by=sort_by, sort_order="asc", page_size=10, cursor=response["next_cursor"])
+			self.assertIndexUsed(queries, "bp", index, "cursor_value")
+
+	def test_page_of_user_posts(self):
+		with capture_queries() as queries:
+			_, cursor = get_page("Blog Post1", ["name", "title"], filters={"user": self.user.name}, limit=10)
+			get_page("Blog Post1", ["name", "title"], filters={"user": self.user.name}, limit=10, cursor=cursor)
+		self.assertIndexUsed(queries, "tabBlog Post1", "user_creation_index")
+
+	def test_category_timeline(self):
+		with capture_queries() as queries:
+			_query_posts("category", self.categories[0], 20)
+		self.assertIndexUsed(queries, "tabBlog Post1", "category_creation_index")
+
+	def test_published_blog_listing(self):
+		with capture_queries() as queries:
+			get_blog_list_page(1)
+		self.assertIndexUsed(queries, "tabBlog Post2", "status_published_on_index", "Published")
+
+	def test_blog_route_lookup(self):
+		with capture_queries() as queries:
+			get_blog_by_route(self.blog.route)
+		self.assertIndexUsed(queries, "bp", "route", "route")
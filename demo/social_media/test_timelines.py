@@ -0,0 +1,57 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from demo.social_media import timelines
+from demo.social_media.timelines import END_MEMBER, END_SCORE, MemoryTimelineStore, get_timeline_key
+
+
+class TestTimelines(FrappeTestCase):
+	def setUp(self):
+		self.store = MemoryTimelineStore()
+		timelines.set_store(self.store)
+		self.key = get_timeline_key("category", "Timeline Test")
+
+	def tearDown(self):
+		timelines.set_store(None)
+
+	def test_page_orders_ties_by_name(self):
+		self.store.add(self.key, {"POST0001": 10.0, "POST0002": 20.0, "POST0003": 20.0, "POST0004": 30.0}, 10)
+		first = self.store.page(self.key, 2)
+		self.assertEqual([m for m, _ in first], ["POST0004", "POST0003"])
+		rest = self.store.page(self.key, 10, before=(first[-1][1], first[-1][0]))
+		self.assertEqual([m for m, _ in rest], ["POST0002", "POST0001"])
+
+	def test_length_is_bounded_and_end_marker_goes_first(self):
+		self.store.replace(self.key, {"POST0001": 10.0, "POST0002": 20.0, END_MEMBER: END_SCORE}, 3)
+		self.store.add(self.key, {"POST0003": 30.0}, 3)
+		self.assertEqual([m for m, _ in self.store.page(self.key, 10)], ["POST0003", "POST0002", "POST0001"])
+
+	def test_complete_timeline_is_served_from_the_store(self):
+		self.store.replace(self.key, {"POST0001": 10.0, "POST0002": 20.0, END_MEMBER: END_SCORE}, 10)
+		items = timelines.get_timeline_page("category", "Timeline Test", 5)
+		self.assertEqual(items, [("POST0002", 20.0), ("POST0001", 10.0)])
+
+	def test_add_and_remove_posts(self):
+		self.store.replace(self.key, {END_MEMBER: END_SCORE}, 10)
+		post = {"name": "POST0001", "creation": "2026-10-18 10:00:00", "category": "Timeline Test", "user": "BU-1"}
+		timelines.add_posts([post])
+		# written once the transaction commits
+		self.assertEqual(self.store.page(self.key, 5), [(END_MEMBER, END_SCORE)])
+		frappe.db.after_commit.run()
+		self.assertEqual([m for m, _ in timelines.get_timeline_page("category", "Timeline Test", 5)], ["POST0001"])
+		# the user's timeline was never built, it is left for the first read to build
+		self.assertFalse(self.store.exists(get_timeline_key("user", "BU-1")))
+
+		timelines.remove_posts([post])
+		frappe.db.after_commit.run()
+		self.assertEqual(timelines.get_timeline_page("category", "Timeline Test", 5), [])
+
+	def test_rolled_back_removal_keeps_the_posts(self):
+		self.store.replace(self.key, {"POST0001": 10.0, END_MEMBER: END_SCORE}, 10)
+		timelines.remove_posts([{"name": "POST0001", "category": "Timeline Test"}])
+		frappe.db.rollback()
+		frappe.db.after_commit.run()
+		self.assertEqual(self.store.page(self.key, 5), [("POST0001", 10.0), (END_MEMBER, END_SCORE)])
@@ -0,0 +1,140 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now_datetime
+
+from demo.social_media import bulk, trending
+from demo.social_media.trending import HALF_LIFE, like_weight
+
+
+class TestTrending(FrappeTestCase):
+	def test_like_weight_halves_every_half_life(self):
+		now = datetime(2026, 10, 18, 12, 0, 0)
+		epoch = now.timestamp()
+		self.assertAlmostEqual(like_weight(now, epoch), 1.0)
+		self.assertAlmostEqual(like_weight(now - timedelta(seconds=HALF_LIFE), epoch), 0.5)
+		self.assertAlmostEqual(like_weight(now + timedelta(seconds=2 * HALF_LIFE), epoch), 4.0)
+
+	def test_older_likes_rank_lower(self):
+		epoch = datetime(2026, 10, 18).timestamp()
+		fresh = 3 * like_weight(datetime(2026, 10, 18, 12), epoch)
+		stale = 10 * like_weight(datetime(2026, 10, 16, 12), epoch)
+		self.assertGreater(fresh, stale)
+
+
+class TestTrendingLists(FrappeTestCase):
+	"""record_like, refresh_posts, remove_posts and rebalance against the Redis keys, under a test-only prefix."""
+
+	def setUp(self):
+		self.prefix = f"social_media:test_trending:{frappe.generate_hash(length=8)}:"
+		self.patches = [
+			patch.object(trending, "EPOCH_KEY", f"{self.prefix}epoch"),
+			patch.object(trending, "SCORES_KEY", f"{self.prefix}scores"),
+			patch.object(trending, "TOP_KEY_PREFIX", f"{self.prefix}top:"),
+		]
+		for p in self.patches:
+			p.start()
+		self.redis = frappe.cache()
+		self.epoch = time.time()
+		self.redis.set(trending._key(trending.EPOCH_KEY), self.epoch)
+
+	def tearDown(self):
+		self.delete_keys(*self.redis.scan_iter(match=trending._key(f"{self.prefix}*")))
+		for p in self.patches:
+			p.stop()
+
+	def delete_keys(self, *keys):
+		# a plain pipeline, RedisWrapper.delete would prefix the keys again
+		pipe = self.redis.pipeline()
+		for key in keys:
+			pipe.delete(key)
+		pipe.execute()
+
+	def get_list(self, key):
+		rows = self.redis.zrevrange(trending._key(key), 0, -1, withscores=True)
+		return {member.decode(): score for member, score in rows}
+
+	def make_posts(self, categories, likes):
+		"""Blog Post1 rows in `categories` with `likes[i]` likes each, inserted without the like hooks."""
+		categories = [f"{category} {self.prefix}" for category in categories]
+		posts = bulk.insert_rows(
+			"Blog Post1",
+			"POST",
+			[bulk.post_row({"title": "Trending post", "category": category, "user": "BU-trending"}) for category in categories],
+		)
+		bulk.insert_rows(
+			"Blog Like1",
+			"LIKE",
+			[
+				bulk.like_row({"post": post, "user": f"BU-trending-{i}"})
+				for post, count in zip(posts, likes, strict=True)
+				for i in range(count)
+			],
+		)
+		return posts
+
+	def test_like_is_ignored_before_the_first_rebalance(self):
+		self.delete_keys(trending._key(trending.EPOCH_KEY))
+		trending.record_like("POST-A", "News", now_datetime())
+		self.assertEqual(self.get_list(trending.SCORES_KEY), {})
+
+	def test_record_like_and_unlike(self):
+		liked_at = datetime.fromtimestamp(self.epoch)
+		trending.record_like("POST-A", "News", liked_at)
+		trending.record_like("POST-A", "News", liked_at)
+		trending.record_like("POST-B", None, liked_at)
+
+		self.assertAlmostEqual(self.get_list(trending.SCORES_KEY)["POST-A"], 2.0)
+		self.assertEqual(list(self.get_list(trending.get_top_key())), ["POST-A", "POST-B"])
+		self.assertEqual(list(self.get_list(trending.get_top_key("News"))), ["POST-A"])
+
+		trending.record_like("POST-B", None, liked_at, delta=-1)
+		self.assertNotIn("POST-B", self.get_list(trending.SCORES_KEY))
+		self.assertNotIn("POST-B", self.get_list(trending.get_top_key()))
+
+	def test_lists_keep_the_top_k(self):
+		liked_at = datetime.fromtimestamp(self.epoch)
+		with patch.object(trending, "TOP_K", 2):
+			for post, likes in (("POST-A", 1), ("POST-B", 3), ("POST-C", 2)):
+				for _ in range(likes):
+					trending.record_like(post, "News", liked_at)
+
+		self.assertEqual(list(self.get_list(trending.get_top_key())), ["POST-B", "POST-C"])
+		self.assertEqual(list(self.get_list(trending.get_top_key("News"))), ["POST-B", "POST-C"])
+		# scores of posts outside the lists are kept, they can climb back in
+		self.assertEqual(set(self.get_list(trending.SCORES_KEY)), {"POST-A", "POST-B", "POST-C"})
+
+	def test_refresh_and_remove_posts(self):
+		news, sport = self.make_posts(["News", "Sport"], [3, 1])
+		trending.refresh_posts([news, sport])
+
+		scores = self.get_list(trending.SCORES_KEY)
+		self.assertAlmostEqual(scores[news], 3.0, places=2)
+		self.assertAlmostEqual(scores[sport], 1.0, places=2)
+		self.assertEqual(list(self.get_list(trending.get_top_key(f"Sport {self.prefix}"))), [sport])
+
+		trending.remove_posts([{"name": news, "category": f"News {self.prefix}"}])
+		self.assertNotIn(news, self.get_list(trending.SCORES_KEY))
+		self.assertNotIn(news, self.get_list(trending.get_top_key()))
+		self.assertEqual(self.get_list(trending.get_top_key(f"News {self.prefix}")), {})
+
+	def test_rebalance_rebuilds_from_likes(self):
+		news, sport = self.make_posts(["News", "Sport"], [2, 4])
+		# left over from a post that no longer has recent likes
+		self.redis.zadd(trending._key(trending.get_top_key("Old")), {"POST-OLD": 5.0})
+
+		trending.rebalance()
+
+		self.assertGreaterEqual(trending.get_epoch(), self.epoch)
+		self.assertEqual(self.get_list(trending.get_top_key("Old")), {})
+		self.assertEqual(list(self.get_list(trending.get_top_key(f"News {self.prefix}"))), [news])
+		scores = self.get_list(trending.SCORES_KEY)
+		self.assertGreater(scores[sport], scores[news])
+		decayed = dict(trending.get_trending(category=f"Sport {self.prefix}"))
+		self.assertAlmostEqual(decayed[sport], 4.0, places=2)
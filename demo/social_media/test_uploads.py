@@ -0,0 +1,48 @@
+# Copyright (c) 2026, demo and Contributors
+# See license.txt
+
+import io
+import os
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from werkzeug.datastructures import FileStorage
+
+from demo.social_media.uploads import InvalidImage, receive_image, sniff_image_type
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+
+def make_upload(content, filename="photo.png"):
+	return FileStorage(stream=io.BytesIO(content), filename=filename)
+
+
+class TestUploads(FrappeTestCase):
+	def test_sniff_image_type(self):
+		self.assertEqual(sniff_image_type(b"\xff\xd8\xff\xe0\x00\x10JFIF"), (".jpg", "image/jpeg"))
+		self.assertEqual(sniff_image_type(PNG_HEADER), (".png", "image/png"))
+		self.assertEqual(sniff_image_type(b"RIFF\x24\x00\x00\x00WEBPVP8 "), (".webp", "image/webp"))
+		self.assertIsNone(sniff_image_type(b"<?php echo 1;"))
+
+	def test_receive_image_streams_to_disk(self):
+		content = PNG_HEADER + b"\x00" * 200_000
+		received = receive_image(make_upload(content), max_size=len(content))
+		try:
+			self.assertEqual(received.size, len(content))
+			self.assertEqual(received.extension, ".png")
+			with open(received.path, "rb") as f:
+				self.assertEqual(f.read(), content)
+		finally:
+			received.discard()
+		self.assertIsNone(received.path)
+
+	def test_rejects_wrong_type_by_content(self):
+		with self.assertRaises(InvalidImage):
+			receive_image(make_upload(b"GIF-looking text", filename="photo.gif"))
+
+	def test_rejects_oversized_upload_while_reading(self):
+		files_path = frappe.get_site_path("public", "files")
+		files_before = set(os.listdir(files_path))
+		with self.assertRaises(InvalidImage):
+			receive_image(make_upload(PNG_HEADER + b"\x00" * 2048), max_size=1024)
+		self.assertEqual(set(os.listdir(files_path)), files_before)
@@ -0,0 +1,290 @@
+from datetime import datetime
+
+import frappe
+from frappe.utils import get_datetime
+
+from demo.social_media.images import resolve_images
+from demo.social_media.pagination import decode_cursor, encode_cursor, get_limit, get_rows_by_name
+
+# Newest posts kept per timeline, older pages are read from the database
+MAX_TIMELINE_LENGTH = 1000
+TIMELINE_KEY_PREFIX = "social_media:timeline:"
+# Timelines are rebuilt from the database at least this often, which bounds how
+# long one that missed a write (a failed after-commit callback) stays wrong
+TIMELINE_TTL = 24 * 60 * 60
+
+# Sorts below every post. A timeline holding it has every older post too, trimming
+# the oldest entries removes it first, after which reads past the end go to the database.
+END_MEMBER = ""
+END_SCORE = 0
+
+# Timeline kind -> Blog Post1 field it groups posts by
+TIMELINE_FIELDS = {"category": "category", "user": "user"}
+
+# Adds scored members and trims to ARGV[2] entries; a key created here (the
+# timeline expired meanwhile) gets a TTL, an existing one keeps its own.
+# ARGV: ttl, max length, score, member, score, member, ...
+ADD_MEMBERS = """
+for i = 3, #ARGV, 2 do
+    redis.call('zadd', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('zremrangebyrank', KEYS[1], 0, -(tonumber(ARGV[2]) + 1))
+if redis.call('ttl', KEYS[1]) == -1 then
+    redis.call('expire', KEYS[1], ARGV[1])
+end
+"""
+
+
+class RedisTimelineStore:
+    """
+    Timelines as Redis sorted sets of post name -> creation timestamp. Keys are
+    prefixed here, so only sorted set commands are used: RedisWrapper prefixes
+    the keys of its own generic ones (exists, hset, ...) a second time.
+    """
+
+    def __init__(self, redis, ttl=TIMELINE_TTL):
+        self.redis = redis
+        self.ttl = ttl
+
+    def _key(self, key):
+        return self.redis.make_key(key) if hasattr(self.redis, "make_key") else key
+
+    def exists(self, key):
+        return self.redis.zcard(self._key(key)) > 0
+
+    def add(self, key, items, max_length):
+        args = [self.ttl, max_length]
+        for member, score in items.items():
+            args += [score, member]
+        self.redis.eval(ADD_MEMBERS, 1, self._key(key), *args)
+
+    def replace(self, key, items, max_length):
+        key = self._key(key)
+        pipe = self.redis.pipeline()
+        pipe.zremrangebyrank(key, 0, -1)
+        if items:
+            pipe.zadd(key, items)
+            # ranks run oldest first, keep the newest max_length
+            pipe.zremrangebyrank(key, 0, -(max_length + 1))
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def remove(self, key, members):
+        if members:
+            self.redis.zrem(self._key(key), *members)
+
+    def delete(self, key):
+        self.redis.zremrangebyrank(self._key(key), 0, -1)
+
+    def page(self, key, count, before=None):
+        """Up to `count` (member, score) pairs, newest first, strictly after `before` (score, member)."""
+        key = self._key(key)
+        if not before:
+            rows = self.redis.zrevrange(key, 0, count - 1, withscores=True)
+            return [(_decode(member), score) for member, score in rows]
+
+        # Equal scores come back in descending member order, skip those up to the cursor
+        max_score, max_member = before
+        result, start = [], 0
+        while len(result) < count:
+            rows = self.redis.zrevrangebyscore(key, max_score, "-inf", start=start, num=count, withscores=True)
+            if not rows:
+                break
+            start += len(rows)
+            for member, score in rows:
+                member = _decode(member)
+                if score == max_score and member >= max_member:
+                    continue
+                result.append((member, score))
+        return result[:count]
+
+
+def _decode(member):
+    return member.decode() if isinstance(member, bytes) else member
+
+
+class MemoryTimelineStore:
+    """In-process stand-in for RedisTimelineStore, for tests and single-process setups. Entries do not expire."""
+
+    def __init__(self):
+        self.sets = {}
+
+    def exists(self, key):
+        return bool(self.sets.get(key))
+
+    def add(self, key, items, max_length):
+        timeline = self.sets.setdefault(key, {})
+        timeline.update(items)
+        for member, _ in self._sorted(key)[max_length:]:
+            del timeline[member]
+
+    def replace(self, key, items, max_length):
+        self.sets.pop(key, None)
+        if items:
+            self.add(key, items, max_length)
+
+    def remove(self, key, members):
+        timeline = self.sets.get(key, {})
+        for member in members:
+            timeline.pop(member, None)
+
+    def delete(self, key):
+        self.sets.pop(key, None)
+
+    def _sorted(self, key):
+        return sorted(self.sets.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    def page(self, key, count, before=None):
+        rows = self._sorted(key)
+        if before:
+            max_score, max_member = before
+            rows = [(m, s) for m, s in rows if (s, m) < (max_score, max_member)]
+        return rows[:count]
+
+
+_store = None
+
+
+def get_store():
+    return _store or RedisTimelineStore(frappe.cache())
+
+
+def set_store(store):
+    """Swap the backing store, e.g. for a MemoryTimelineStore in tests. None restores Redis."""
+    global _store
+    _store = store
+
+
+def get_timeline_key(kind, value):
+    return f"{TIMELINE_KEY_PREFIX}{kind}:{value}"
+
+
+def get_score(creation):
+    return get_datetime(creation).timestamp()
+
+
+def _query_posts(kind, value, limit, before=None):
+    """(name, score) of a category's or user's posts from the database, newest first."""
+    params = {"value": value, "limit": limit}
+    keyset = ""
+    if before:
+        params["cursor_creation"] = datetime.fromtimestamp(before[0])
+        params["cursor_name"] = before[1]
+        keyset = """AND (creation < %(cursor_creation)s
+            OR (creation = %(cursor_creation)s AND name < %(cursor_name)s))"""
+
+    posts = frappe.db.sql(f"""
+        SELECT name, creation
+        FROM `tabBlog Post1`
+        WHERE `{TIMELINE_FIELDS[kind]}` = %(value)s {keyset}
+        ORDER BY creation DESC, name DESC
+        LIMIT %(limit)s
+    """, params, as_dict=True)
+    return [(p.name, get_score(p.creation)) for p in posts]
+
+
+def build_timeline(kind, value):
+    items = dict(_query_posts(kind, value, MAX_TIMELINE_LENGTH))
+    if len(items) < MAX_TIMELINE_LENGTH:
+        items[END_MEMBER] = END_SCORE
+    get_store().replace(get_timeline_key(kind, value), items, MAX_TIMELINE_LENGTH)
+
+
+def get_timeline_page(kind, value, limit, before=None):
+    """
+    (name, score) pairs of the next `limit` posts in a timeline, newest first.
+    The stored timeline is built on first use, pages beyond its bounded
+    length continue from the database.
+    """
+    store = get_store()
+    key = get_timeline_key(kind, value)
+    if not store.exists(key):
+        build_timeline(kind, value)
+
+    items = store.page(key, limit, before)
+    if (END_MEMBER, END_SCORE) in items:
+        return items[:items.index((END_MEMBER, END_SCORE))]
+
+    if len(items) < limit:
+        last = (items[-1][1], items[-1][0]) if items else before
+        items += _query_posts(kind, value, limit - len(items), last)
+    return items
+
+
+def get_feed(kind, value, fields, limit=None, cursor=None, image_field=None):
+    """One page of a timeline as Blog Post1 rows with `fields`, returns (rows, next_cursor)."""
+    limit = get_limit(limit)
+    before = tuple(decode_cursor(cursor, 2)) if cursor else None
+    items = get_timeline_page(kind, value, limit + 1, before)
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1][1], items[-1][0])
+
+    # Entries of posts whose insert was rolled back have no row and are skipped
+    posts = get_rows_by_name("Blog Post1", [name for name, _ in items], [*fields, *filter(None, [image_field])])
+    return resolve_images(posts, image_field), next_cursor
+
+
+def add_posts(posts):
+    """
+    Add posts (dicts with name, creation, category, user) to the timelines
+    already built, once the current transaction commits.
+    """
+    grouped = {}
+    for post in posts:
+        score = get_score(post["creation"])
+        for kind, fieldname in TIMELINE_FIELDS.items():
+            if post.get(fieldname):
+                grouped.setdefault(get_timeline_key(kind, post[fieldname]), {})[post["name"]] = score
+
+    def add():
+        store = get_store()
+        for key, items in grouped.items():
+            # Unbuilt timelines are built from the database when first read
+            if store.exists(key):
+                store.add(key, items, MAX_TIMELINE_LENGTH)
+
+    # Written any earlier, a rollback would leave entries of posts that were never saved
+    if grouped:
+        frappe.db.after_commit.add(add)
+
+
+def remove_posts(posts):
+    """Take posts (dicts with name, category, user) out of their timelines once the current transaction commits."""
+    grouped = {}
+    for post in posts:
+        for kind, fieldname in TIMELINE_FIELDS.items():
+            if post.get(fieldname):
+                grouped.setdefault(get_timeline_key(kind, post[fieldname]), []).append(post["name"])
+
+    def remove():
+        store = get_store()
+        for key, names in grouped.items():
+            store.remove(key, names)
+
+    # Removed any earlier, a rollback would leave the restored posts out of their timelines
+    if grouped:
+        frappe.db.after_commit.add(remove)
+
+
+# doc_events: Blog Post1 on_update
+def on_post_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    if before:
+        if all(before.get(f) == doc.get(f) for f in TIMELINE_FIELDS.values()):
+            return
+        remove_posts([before.as_dict()])
+    add_posts([doc.as_dict()])
+
+
+# doc_events: Blog Post1 on_trash
+def on_post_trash(doc, method=None):
+    remove_posts([doc.as_dict()])
+
+
+# doc_events: Blog User on_trash
+def on_user_delete(doc, method=None):
+    key = get_timeline_key("user", doc.name)
+    frappe.db.after_commit.add(lambda: get_store().delete(key))
@@ -0,0 +1,190 @@
+import time
+from datetime import datetime
+
+import frappe
+from frappe.utils import get_datetime
+
+# A like's weight halves every HALF_LIFE seconds
+HALF_LIFE = 24 * 60 * 60
+# Likes older than this weigh under 1/128 of a fresh one and are left out of rebuilds
+SCORE_WINDOW = 7 * HALF_LIFE
+# Posts kept in each trending list
+TOP_K = 100
+# Scores left over after unlikes are float noise below this
+MIN_SCORE = 1e-6
+
+# Scores are sums of 2 ** ((liked_at - epoch) / HALF_LIFE): a like never needs
+# rescoring as time passes, newer likes simply weigh more. rebalance() moves the
+# epoch forward so the numbers stay small, and rebuilds the lists from Blog Like1.
+EPOCH_KEY = "social_media:trending:epoch"
+# Sorted set of every post liked within the window -> score
+SCORES_KEY = "social_media:trending:scores"
+# Sorted sets of the TOP_K posts, overall and per Blog Category1
+TOP_KEY_PREFIX = "social_media:trending:top:"
+GLOBAL_LIST = "all"
+
+
+def get_top_key(category=None):
+    return f"{TOP_KEY_PREFIX}{f'category:{category}' if category else GLOBAL_LIST}"
+
+
+def like_weight(liked_at, epoch):
+    return 2 ** ((get_datetime(liked_at).timestamp() - epoch) / HALF_LIFE)
+
+
+def _redis():
+    return frappe.cache()
+
+
+def _key(key):
+    # prefixed here and used with plain Redis commands only, RedisWrapper's
+    # helpers (get_value, hget, exists, ...) would prefix the key a second time
+    return _redis().make_key(key)
+
+
+def get_epoch():
+    """Epoch the stored scores are relative to, None until the first rebalance."""
+    epoch = _redis().get(_key(EPOCH_KEY))
+    return float(epoch) if epoch is not None else None
+
+
+def _set_score(pipe, post, category, score):
+    keys = [get_top_key(), get_top_key(category)] if category else [get_top_key()]
+    if score < MIN_SCORE:
+        for key in [SCORES_KEY, *keys]:
+            pipe.zrem(_key(key), post)
+        return
+    for key in keys:
+        pipe.zadd(_key(key), {post: score})
+        # ranks run lowest score first, keep the TOP_K highest
+        pipe.zremrangebyrank(_key(key), 0, -(TOP_K + 1))
+
+
+def record_like(post, category, liked_at, delta=1):
+    """Add (delta=1) or take back (delta=-1) the weight of one like, O(log n) per list."""
+    epoch = get_epoch()
+    if epoch is None:
+        # nothing to update yet, the first rebalance counts this like from the table
+        return
+
+    redis = _redis()
+    score = redis.zincrby(_key(SCORES_KEY), delta * like_weight(liked_at, epoch), post)
+    pipe = redis.pipeline()
+    _set_score(pipe, post, category, score)
+    pipe.execute()
+
+
+def _query_scores(epoch, posts=None):
+    """Decayed scores of posts liked within SCORE_WINDOW, with their category."""
+    # naive datetimes on both sides, like get_datetime(...).timestamp() in like_weight
+    condition = "AND bl.post IN %(posts)s" if posts else ""
+    return frappe.db.sql(f"""
+        SELECT bl.post, bp.category,
+            SUM(POW(2, TIMESTAMPDIFF(MICROSECOND, %(epoch)s, bl.creation) / 1000000 / %(half_life)s)) AS score
+        FROM `tabBlog Like1` bl
+        INNER JOIN `tabBlog Post1` bp ON bp.name = bl.post
+        WHERE bl.creation >= %(since)s {condition}
+        GROUP BY bl.post, bp.category
+    """, {
+        "epoch": datetime.fromtimestamp(epoch),
+        "half_life": HALF_LIFE,
+        "since": datetime.fromtimestamp(time.time() - SCORE_WINDOW),
+        "posts": tuple(posts or ()),
+    }, as_dict=True)
+
+
+def refresh_posts(posts):
+    """Recount the scores of some posts from Blog Like1, after writes that bypass the like hooks."""
+    epoch = get_epoch()
+    posts = list(set(filter(None, posts)))
+    if epoch is None or not posts:
+        return
+
+    scores = {row.post: row for row in _query_scores(epoch, posts)}
+    categories = dict(frappe.get_all(
+        "Blog Post1", filters={"name": ["in", posts]}, fields=["name", "category"], as_list=True
+    ))
+    pipe = _redis().pipeline()
+    for post in posts:
+        score = float(scores[post].score) if post in scores else 0
+        if score >= MIN_SCORE:
+            pipe.zadd(_key(SCORES_KEY), {post: score})
+        _set_score(pipe, post, categories.get(post), score)
+    pipe.execute()
+
+
+def remove_posts(posts):
+    """Drop deleted posts (dicts with name and category) from every trending list."""
+    posts = [p for p in posts if p.get("name")]
+    if not posts:
+        return
+    pipe = _redis().pipeline()
+    for post in posts:
+        _set_score(pipe, post["name"], post.get("category"), 0)
+    pipe.execute()
+
+
+def rebalance():
+    """
+    Scheduled job: rebuild the scores and the top-K lists from the likes of the
+    last SCORE_WINDOW, relative to a fresh epoch. Corrects drift from posts that
+    dropped out of a list and came back, and keeps the stored numbers small.
+    """
+    epoch = time.time()
+    rows = _query_scores(epoch)
+
+    redis = _redis()
+    old_keys = list(redis.scan_iter(match=_key(f"{TOP_KEY_PREFIX}*"), count=1000))
+    pipe = redis.pipeline()
+    for key in [_key(SCORES_KEY), *old_keys]:
+        pipe.zremrangebyrank(key, 0, -1)
+
+    lists = {}
+    for row in rows:
+        lists.setdefault(get_top_key(), {})[row.post] = float(row.score)
+        if row.category:
+            lists.setdefault(get_top_key(row.category), {})[row.post] = float(row.score)
+    if rows:
+        pipe.zadd(_key(SCORES_KEY), {row.post: float(row.score) for row in rows})
+    for key, scores in lists.items():
+        top = dict(sorted(scores.items(), key=lambda item: item[1], reverse=True)[:TOP_K])
+        pipe.zadd(_key(key), top)
+
+    pipe.set(_key(EPOCH_KEY), epoch)
+    # MULTI/EXEC, readers never see a half built list
+    pipe.execute()
+
+
+def get_trending(category=None, limit=20):
+    """(post name, score decayed to now) of the top posts, highest first. O(limit) for limit <= TOP_K."""
+    epoch = get_epoch()
+    if epoch is None:
+        rebalance()
+        epoch = get_epoch()
+
+    rows = _redis().zrevrange(_key(get_top_key(category)), 0, min(limit, TOP_K) - 1, withscores=True)
+    decay = 2 ** ((epoch - time.time()) / HALF_LIFE)
+    return [(post.decode() if isinstance(post, bytes) else post, score * decay) for post, score in rows]
+
+
+# doc_events: Blog Like1 after_insert
+def on_like_insert(doc, method=None):
+    record_like(doc.post, frappe.db.get_value("Blog Post1", doc.post, "category"), doc.creation)
+
+
+# doc_events: Blog Like1 on_trash
+def on_like_trash(doc, method=None):
+    record_like(doc.post, frappe.db.get_value("Blog Post1", doc.post, "category"), doc.creation, delta=-1)
+
+
+# doc_events: Blog Post1 on_update
+def on_post_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    if before and before.category != doc.category:
+        remove_posts([before.as_dict()])
+        refresh_posts([doc.name])
+
+
+# doc_events: Blog Post1 on_trash
+def on_post_trash(doc, method=None):
+    remove_posts([doc.as_dict()])
@@ -0,0 +1,286 @@
+import hashlib
+import os
+import tempfile
+from collections import Counter
+
+import frappe
+from frappe.utils import cint
+
+from demo.social_media.images import remove_derivatives
+
+# Magic bytes of the accepted image formats: (signature, extension, MIME type)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", ".png", "image/png"),
+    (b"GIF87a", ".gif", "image/gif"),
+    (b"GIF89a", ".gif", "image/gif"),
+)
+SNIFF_LENGTH = 12
+
+# Overridable with "social_media_max_image_size" (bytes) in site_config.json
+DEFAULT_MAX_IMAGE_SIZE = 10 * 1024 * 1024
+# Frappe reads the whole request body before any handler runs. Only the request
+# limit bounds that memory: request.max_content_length, which Frappe sets from
+# "max_file_size" in site_config.json (this default when unset), and nginx's
+# client_max_body_size in front of it. Keep both near the image limit.
+FRAPPE_DEFAULT_MAX_FILE_SIZE = 25 * 1024 * 1024
+# Room for the other form fields when judging a request by its Content-Length
+FORM_OVERHEAD = 256 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Stored images are named after the SHA-256 of their content, under public/files
+IMAGES_FOLDER = "images"
+
+
+class InvalidImage(frappe.ValidationError):
+    pass
+
+
+def get_request_size_limit():
+    return cint(frappe.conf.get("max_file_size")) or FRAPPE_DEFAULT_MAX_FILE_SIZE
+
+
+def get_max_image_size():
+    configured = cint(frappe.conf.get("social_media_max_image_size")) or DEFAULT_MAX_IMAGE_SIZE
+    # an image can never be larger than the request carrying it
+    return min(configured, get_request_size_limit() - FORM_OVERHEAD)
+
+
+def sniff_image_type(header):
+    """(extension, MIME type) of an image from its first bytes, None for anything else."""
+    for signature, extension, mimetype in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return extension, mimetype
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp", "image/webp"
+    return None
+
+
+def _too_large(max_size):
+    return InvalidImage(f"Image must not be larger than {max_size / (1024 * 1024):g} MB")
+
+
+class ReceivedImage:
+    """An upload written to a temporary file beside the public files, not yet registered as a File."""
+
+    def __init__(self, path, extension, mimetype, size, content_hash, digest):
+        self.path = path
+        self.extension = extension
+        self.mimetype = mimetype
+        self.size = size
+        # md5 as Frappe's File.content_hash, SHA-256 for the content-addressed name
+        self.content_hash = content_hash
+        self.digest = digest
+
+    def discard(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+
+
+def receive_image(image_file, max_size=None):
+    """
+    Copy an uploaded image to disk in UPLOAD_CHUNK_SIZE chunks, checking its
+    type from the magic bytes and its size while reading, so no second full
+    copy is held in memory. Touches no database, raises InvalidImage as soon
+    as the upload is rejected.
+    """
+    max_size = max_size or get_max_image_size()
+    if image_file.content_length and image_file.content_length > max_size:
+        raise _too_large(max_size)
+
+    header = image_file.stream.read(SNIFF_LENGTH)
+    detected = sniff_image_type(header)
+    if not detected:
+        raise InvalidImage("Image must be a JPEG, PNG, GIF or WebP file")
+
+    fd, path = tempfile.mkstemp(prefix=".upload-", dir=frappe.get_site_path("public", "files"))
+    size = 0
+    content_hash = hashlib.md5(usedforsecurity=False)
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as out:
+            chunk = header
+            while chunk:
+                size += len(chunk)
+                if size > max_size:
+                    raise _too_large(max_size)
+                content_hash.update(chunk)
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = image_file.stream.read(UPLOAD_CHUNK_SIZE)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return ReceivedImage(path, *detected, size, content_hash.hexdigest(), digest.hexdigest())
+
+
+def receive_request_image(fieldname="image", max_size=None):
+    """
+    receive_image for the `fieldname` upload of the current request, None when
+    nothing was uploaded. Frappe has already read the body by now, within the
+    request limit (see get_request_size_limit); the Content-Length check only
+    rejects oversized requests before any image or database work.
+    """
+    max_size = max_size or get_max_image_size()
+    content_length = frappe.request.content_length
+    if content_length and content_length > max_size + FORM_OVERHEAD:
+        raise _too_large(max_size)
+
+    image_file = frappe.request.files.get(fieldname)
+    if not image_file:
+        return None
+    return receive_image(image_file, max_size)
+
+
+def save_image(received):
+    """
+    Store a received image under its content hash and return its URL. Content
+    that is already stored is not written again, the upload is discarded and
+    the existing URL returned. References are counted by acquire_images.
+    """
+    file_name = f"{received.digest}{received.extension}"
+    file_url = f"/files/{IMAGES_FOLDER}/{file_name}"
+    file_row = {
+        "file_name": file_name,
+        "file_url": file_url,
+        "file_size": received.size,
+        "file_type": received.extension.lstrip(".").upper(),
+        "content_hash": received.content_hash
+    }
+
+    # The row lock keeps a concurrent release_images from removing the image before we reference it
+    if frappe.db.sql("SELECT name FROM `tabBlog Image` WHERE name = %s FOR UPDATE", received.digest):
+        received.discard()
+        _insert_file_row(file_row)
+        return file_url
+
+    folder = frappe.get_site_path("public", "files", IMAGES_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+    os.chmod(received.path, 0o644)
+    os.replace(received.path, os.path.join(folder, file_name))
+    received.path = None
+    frappe.db.after_rollback.add(lambda: _remove_unused_files([file_url]))
+
+    image_doc = frappe.get_doc({
+        "doctype": "Blog Image",
+        "name": received.digest,
+        "file_url": file_url,
+        "file_size": received.size,
+        "ref_count": 0
+    })
+    image_doc.set_user_and_timestamp()
+    frappe.db.savepoint("blog_image_insert")
+    try:
+        image_doc.db_insert()
+    except (frappe.UniqueValidationError, frappe.DuplicateEntryError):
+        # Stored by a concurrent upload of the same content, which wrote identical bytes
+        frappe.db.rollback(save_point="blog_image_insert")
+        _insert_file_row(file_row)
+        return file_url
+
+    _insert_file_row(file_row, attached_to_name=received.digest)
+    _insert_file_row(file_row)
+    return file_url
+
+
+def _insert_file_row(file_row, attached_to_name=None):
+    """
+    Write a File row for a stored image. With attached_to_name it anchors the
+    image to its Blog Image; without, it is left unattached for the post's
+    Attach Image field to claim, as Frappe's attach_files_to_document does
+    before falling back to inserting a File that reads the whole image again.
+    File.before_insert would read it back to hash and size it as well, both
+    are known from streaming already, so only the row is written.
+    """
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        **file_row,
+        "folder": "Home/Attachments",
+        "attached_to_doctype": "Blog Image" if attached_to_name else None,
+        "attached_to_name": attached_to_name,
+        "is_private": 0
+    })
+    file_doc.set_new_name()
+    file_doc.set_user_and_timestamp()
+    file_doc.db_insert()
+
+
+def _count(file_urls):
+    return Counter(url for url in file_urls if url and url.startswith(f"/files/{IMAGES_FOLDER}/"))
+
+
+def lock_stored_images(file_urls):
+    """Stored image URLs among `file_urls`, row-locked so they stay stored until the transaction ends."""
+    file_urls = list({url for url in file_urls if url})
+    if not file_urls:
+        return set()
+    return {
+        row[0]
+        for row in frappe.db.sql(
+            "SELECT file_url FROM `tabBlog Image` WHERE file_url IN %(file_urls)s FOR UPDATE",
+            {"file_urls": tuple(file_urls)}
+        )
+    }
+
+
+def acquire_images(file_urls):
+    """Count one more reference for every stored image URL in `file_urls` (repeats count twice)."""
+    for file_url, count in _count(file_urls).items():
+        frappe.db.sql(
+            "UPDATE `tabBlog Image` SET ref_count = ref_count + %(count)s WHERE file_url = %(file_url)s",
+            {"count": count, "file_url": file_url}
+        )
+
+
+def release_images(file_urls):
+    """Drop references to stored images, deleting the ones nothing refers to any more."""
+    counts = _count(file_urls)
+    for file_url, count in counts.items():
+        frappe.db.sql(
+            """
+            UPDATE `tabBlog Image`
+            SET ref_count = GREATEST(ref_count - %(count)s, 0)
+            WHERE file_url = %(file_url)s
+            """,
+            {"count": count, "file_url": file_url}
+        )
+
+    unused = frappe.get_all(
+        "Blog Image", filters={"file_url": ["in", list(counts)], "ref_count": 0}, pluck="file_url"
+    ) if counts else []
+    if not unused:
+        return
+
+    frappe.db.delete("Blog Image", {"file_url": ["in", unused]})
+    # The anchor row and the per-post rows Frappe attached for the Attach Image field
+    frappe.db.delete("File", {"file_url": ["in", unused]})
+    # Files go only once the deletes are committed, a rollback keeps them referenced
+    frappe.db.after_commit.add(lambda: _remove_unused_files(unused))
+
+
+def _remove_unused_files(file_urls):
+    for file_url in file_urls:
+        # Stored again by a later upload of the same content
+        if frappe.db.exists("Blog Image", {"file_url": file_url}):
+            continue
+        path = frappe.get_site_path("public", file_url.lstrip("/"))
+        if os.path.exists(path):
+            os.remove(path)
+        remove_derivatives(file_url)
+
+
+# doc_events: on_update
+def on_post_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    previous = before.image if before else None
+    if previous == doc.image:
+        return
+    acquire_images([doc.image])
+    release_images([previous])
+
+
+# doc_events: on_trash
+def on_post_trash(doc, method=None):
+    release_images([doc.image])
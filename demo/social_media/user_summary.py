@@ -0,0 +1,118 @@
+import json
+
+import frappe
+
+# One Redis hash per Blog User: "posts" -> JSON [[name, title], ...] newest first,
+# "likes:<post>" -> like count. Keys are prefixed here and used with plain Redis
+# commands only, RedisWrapper's helpers (hget, hset, ...) would prefix them again.
+SUMMARY_KEY_PREFIX = "social_media:user_post_summary:"
+# Bounds how long an entry rebuilt from a read that raced a write can stay stale
+SUMMARY_TTL = 60 * 60
+POSTS_FIELD = "posts"
+LIKES_FIELD_PREFIX = "likes:"
+
+# Adds a like delta to a post already in a cached summary, a missing entry is left to the next read
+INCREMENT_LIKES = """
+if redis.call('hexists', KEYS[1], ARGV[1]) == 1 then
+    return redis.call('hincrby', KEYS[1], ARGV[1], ARGV[2])
+end
+return nil
+"""
+
+
+def _key(user):
+    return frappe.cache().make_key(f"{SUMMARY_KEY_PREFIX}{user}")
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _from_hash(entry):
+    entry = {_decode(k): _decode(v) for k, v in entry.items()}
+    posts = json.loads(entry[POSTS_FIELD])
+    return {
+        "total_posts": len(posts),
+        "posts": [
+            {"title": title, "likes": max(int(entry.get(f"{LIKES_FIELD_PREFIX}{name}") or 0), 0)}
+            for name, title in posts
+        ]
+    }
+
+
+def get_user_summaries(user_names):
+    """
+    Post/like summaries for the given users. Cached entries are served from the
+    materialized hashes; the rest are built with one set-based query and stored.
+    """
+    redis = frappe.cache()
+    pipe = redis.pipeline()
+    for user in user_names:
+        pipe.hgetall(_key(user))
+
+    summaries = {}
+    missing = []
+    for user, entry in zip(user_names, pipe.execute(), strict=True):
+        if entry:
+            summaries[user] = _from_hash(entry)
+        else:
+            missing.append(user)
+
+    if missing:
+        built = {user: {POSTS_FIELD: []} for user in missing}
+        posts = frappe.get_all(
+            "Blog Post1",
+            filters={"user": ["in", missing]},
+            fields=["name", "user", "title", "like_count"],
+            order_by="creation desc"
+        )
+        for p in posts:
+            built[p.user][POSTS_FIELD].append([p.name, p.title])
+            built[p.user][f"{LIKES_FIELD_PREFIX}{p.name}"] = p.like_count or 0
+
+        pipe = redis.pipeline()
+        for user, entry in built.items():
+            entry[POSTS_FIELD] = json.dumps(entry[POSTS_FIELD])
+            pipe.hset(_key(user), mapping=entry)
+            pipe.expire(_key(user), SUMMARY_TTL)
+        pipe.execute()
+        summaries.update({user: _from_hash(entry) for user, entry in built.items()})
+
+    return summaries
+
+
+def invalidate_users(user_names):
+    """Drop the summaries of users once the current transaction commits."""
+    keys = [f"{SUMMARY_KEY_PREFIX}{user}" for user in set(user_names) if user]
+    if keys:
+        # Dropped any earlier, a concurrent read could cache the pre-commit rows again
+        frappe.db.after_commit.add(lambda: frappe.cache().delete_value(keys))
+
+
+def add_likes(user, post, delta):
+    """Apply a like count change to a cached summary once the current transaction commits."""
+    if not user:
+        return
+    key = _key(user)
+    frappe.db.after_commit.add(
+        lambda: frappe.cache().eval(INCREMENT_LIKES, 1, key, f"{LIKES_FIELD_PREFIX}{post}", delta)
+    )
+
+
+# doc_events: Blog Post1 on_update / on_trash
+def on_post_change(doc, method=None):
+    before = doc.get_doc_before_save()
+    if method == "on_update" and before and before.user == doc.user and before.title == doc.title:
+        return
+    invalidate_users([doc.user, before.user if before else None])
+
+
+# doc_events: Blog Like1 after_insert / on_trash
+def on_like_change(doc, method=None):
+    owner = frappe.db.get_value("Blog Post1", doc.post, "user")
+    add_likes(owner, doc.post, -1 if method == "on_trash" else 1)
+
+
+# doc_events: Blog User on_trash
+def on_user_delete(doc, method=None):
+    invalidate_users([doc.name])
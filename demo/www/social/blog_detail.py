@@ -1,33 +1,24 @@
 import frappe
+from demo.social_media.blog_cache import get_blog_by_route
 
 def get_context(context):
-    try:
-        route = frappe.form_dict.get("route")
-        frappe.logger().info(f"Route param: {route}")
-
-        if not route:
-            frappe.throw("No route provided.")
+    route = frappe.form_dict.get("route")
 
-        blog = frappe.db.get_value(
-            "Blog Post2",
-            {"route": route, "status": "Published"},
-            ["name", "title", "content", "author", "published_on", "route"],
-            as_dict=True
-        )
+    if not route:
+        frappe.throw("No route provided.")
 
-        if not blog:
-            frappe.throw(f"Blog not found or unpublished for route: {route}")
+    # Post and author in one cached lookup; unknown routes are cached as misses
+    entry = get_blog_by_route(route)
+    blog = entry["blog"]
 
-        author = frappe.db.get_value(
-            "Blog User2",
-            blog.author,
-            ["username", "city"],
-            as_dict=True
-        )
+    # a plain 404, so bad URLs from crawlers neither query nor write an Error Log
+    if not blog:
+        raise frappe.PageDoesNotExistError(f"Blog not found or unpublished for route: {route}")
 
+    try:
         context.blog = blog
-        context.blog_author_name = author.username if author else "Unknown"
-        context.blog_author_city = author.city if author else ""
+        context.blog_author_name = entry["author_name"]
+        context.blog_author_city = entry["author_city"]
 
         # # prev blog
         # context.prev_blog = frappe.db.get_value(
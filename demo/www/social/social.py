@@ -1,52 +1,24 @@
 import frappe
 import re
+from frappe.utils import cint
+from demo.social_media.blog_cache import BLOG_LIST_PAGE_SIZE, get_blog_list_page, get_published_blogs_page
+from demo.social_media.pagination import MAX_PAGE_SIZE
 @frappe.whitelist(allow_guest=True)
-def get_published_blogs(search=None):
-    """Fetch all published blogs with author info (username, city) using Frappe ORM"""
-    
-    filters = {"status": "Published"}
-    
-    if search:
-        filters["title"] = ["like", f"%{search}%"]
-    
-    blogs = frappe.get_all(
-        "Blog Post2",
-        fields=["name", "title", "content", "author", "published_on", "route"],
-        filters=filters,
-        order_by="published_on desc"
-    )
-
-    # Fetch author info for each blog
-    for blog in blogs:
-        author_info = frappe.db.get_value(
-            "Blog User2",
-            blog.author,
-            ["username", "city"],
-            as_dict=True
-        )
-        if author_info:
-            blog["author_name"] = author_info.username
-            blog["author_city"] = author_info.city
-        else:
-            blog["author_name"] = "Unknown"
-            blog["author_city"] = ""
-
-    return blogs
+def get_published_blogs(search=None, page=1, page_size=BLOG_LIST_PAGE_SIZE):
+    """Fetch a page of published blogs with author info (username, city), cached per search"""
+    page = max(cint(page), 1)
+    page_size = min(max(cint(page_size), 1), MAX_PAGE_SIZE)
+    return get_published_blogs_page(search, page, page_size)
 
 def get_context(context):
-    # Get all published blogs
-    blogs = frappe.get_all(
-        "Blog Post2",
-        filters={"status": "Published"},
-        fields=["title", "route", "author", "published_on", "content"],
-        order_by="published_on desc"
-    )
+    # pagination is a query parameter, so the page HTML itself must not be cached by path
+    context.no_cache = 1
 
-    # Truncate content preview (first 200 chars)
-    for blog in blogs:
-        text = re.sub(r"<[^>]*>", "", blog.content or "")
-        blog.preview = text[:200] + ("..." if len(text) > 200 else "")
+    # Previews are computed when a post is saved; each page's listing is cached
+    page = max(cint(frappe.form_dict.get("page")), 1)
+    listing = get_blog_list_page(page)
 
-    context.blogs = blogs
+    context.blogs = listing["blogs"]
+    context.page = page
+    context.has_next = listing["has_next"]
     return context
-